@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ems.settings')
 
 application = get_asgi_application()
+
+# Per-process LISTEN thread feeding the SSE stream at /api/events/
+from exams.events import start_listener  # noqa: E402
+
+start_listener()
@@ -0,0 +1,148 @@
+"""
+Read-replica routing for reporting endpoints.
+
+Views marked with @replica_reads (dashboards, list/summary endpoints,
+exports) read from the "replica" database alias when one is configured
+(DB_REPLICA_HOST, see settings). Everything else, every write and anything
+inside a transaction on the primary stays on "default".
+
+Read-your-writes: a successful non-GET request pins its user to the primary
+for REPLICA_STICKY_SECONDS, so a teacher who just uploaded sees the upload in
+the next list even if the replica is behind. The pin has to be visible to
+whichever worker serves the next request, so it is kept in two places:
+a signed, user-bound cookie on the response (travels with the client) and,
+when the cache is shared between workers (settings.CACHE_SHARED), a cache
+entry (covers clients that do not send cookies back).
+"""
+import contextvars
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.functional import SimpleLazyObject
+
+REPLICA_ALIAS = "replica"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+PIN_COOKIE = "ems_primary_pin"
+
+_scope = contextvars.ContextVar("ems_read_scope", default=None)
+_pin_signer = signing.TimestampSigner(salt="ems.db_router.pin")
+
+
+def _pin_key(user_id):
+    return f"ems:dbpin:{user_id}"
+
+
+def pin_to_primary(response, user_id):
+    """Keep user_id's reads on the primary for REPLICA_STICKY_SECONDS."""
+    response.set_cookie(
+        PIN_COOKIE, _pin_signer.sign(str(user_id)), max_age=settings.REPLICA_STICKY_SECONDS,
+        httponly=True, samesite=settings.REPLICA_PIN_COOKIE_SAMESITE,
+        secure=settings.REPLICA_PIN_COOKIE_SAMESITE == "None",
+    )
+    if settings.CACHE_SHARED:
+        cache.set(_pin_key(user_id), 1, settings.REPLICA_STICKY_SECONDS)
+
+
+def is_pinned(request, user_id):
+    token = getattr(request, "COOKIES", {}).get(PIN_COOKIE)
+    if token:
+        try:
+            if _pin_signer.unsign(token, max_age=settings.REPLICA_STICKY_SECONDS) == str(user_id):
+                return True
+        except signing.BadSignature:  # also covers SignatureExpired
+            pass
+    return settings.CACHE_SHARED and cache.get(_pin_key(user_id)) is not None
+
+
+def _authenticated_user(request):
+    # Only look at a user that authentication has already set: evaluating
+    # the lazy session user here would itself query the database.
+    user = request.__dict__.get("user")
+    if user is None or type(user) is SimpleLazyObject or not user.is_authenticated:
+        return None
+    return user
+
+
+class _ReadScope:
+    def __init__(self, request):
+        self.request = request
+        self.alias = None
+
+    def resolve(self):
+        if self.alias is None:
+            user = _authenticated_user(self.request)
+            if user is None:
+                return None  # still authenticating: primary, decide again on the next query
+            self.alias = DEFAULT_DB_ALIAS if is_pinned(self.request, user.pk) else REPLICA_ALIAS
+        return self.alias
+
+
+def replica_configured():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def current_read_alias():
+    """Alias reads of the current request go to; resolve before handing a queryset to a streaming body."""
+    scope = _scope.get()
+    alias = scope.resolve() if scope is not None and replica_configured() else None
+    return alias or DEFAULT_DB_ALIAS
+
+
+@contextmanager
+def read_scope(request):
+    """Route reads made inside the block as a @replica_reads view for request.user would."""
+    token = _scope.set(_ReadScope(request))
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+
+
+def replica_reads(view):
+    """Mark a view (function, DRF view class or @api_view) as safe to serve from the replica."""
+    view.replica_reads = True
+    return view
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        scope = _scope.get()
+        if scope is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return scope.resolve()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if {obj1._state.db, obj2._state.db} <= {DEFAULT_DB_ALIAS, REPLICA_ALIAS}:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA_ALIAS
+
+
+class ReplicaRoutingMiddleware(MiddlewareMixin):
+    """Opens a read scope for @replica_reads views and pins writers to the primary."""
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method not in SAFE_METHODS:
+            return None
+        view_class = getattr(view_func, "view_class", None)
+        if getattr(view_func, "replica_reads", False) or getattr(view_class, "replica_reads", False):
+            _scope.set(_ReadScope(request))
+        return None
+
+    def process_response(self, request, response):
+        _scope.set(None)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            user = _authenticated_user(request)
+            if user is not None:
+                pin_to_primary(response, user.pk)
+        return response
@@ -2,6 +2,7 @@ import os
 import logging
 from pathlib import Path
 from datetime import timedelta
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -33,6 +34,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "ems.db_router.ReplicaRoutingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -69,6 +71,28 @@ DATABASES = {
     }
 }
 
+# Optional read replica for @replica_reads endpoints (ems/db_router.py). Leave DB_REPLICA_HOST
+# unset for a single database. To try it locally, run a second Postgres as a streaming
+# standby of the first (e.g. on port 5433) and set DB_REPLICA_HOST=127.0.0.1 DB_REPLICA_PORT=5433;
+# `manage.py check_db_routing` then shows where reads go. Tests mirror it onto default.
+if os.getenv("DB_REPLICA_HOST"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": os.getenv("DB_REPLICA_NAME", DATABASES["default"]["NAME"]),
+        "USER": os.getenv("DB_REPLICA_USER", DATABASES["default"]["USER"]),
+        "PASSWORD": os.getenv("DB_REPLICA_PASSWORD", DATABASES["default"]["PASSWORD"]),
+        "HOST": os.getenv("DB_REPLICA_HOST"),
+        "PORT": os.getenv("DB_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_ROUTERS = ["ems.db_router.ReplicaRouter"]
+
+# After a write, the user's reads stay on the primary this long (read-your-writes). The pin
+# travels in a signed cookie and, with a shared cache (CACHE_SHARED), in the cache as well.
+# Cross-site frontends need REPLICA_PIN_COOKIE_SAMESITE=None (HTTPS) or the shared cache.
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "10"))
+REPLICA_PIN_COOKIE_SAMESITE = os.getenv("REPLICA_PIN_COOKIE_SAMESITE", "Lax")
+
 # Custom user
 AUTH_USER_MODEL = "exams.CustomUser"
 
@@ -80,13 +104,71 @@ AUTHENTICATION_BACKENDS = [
 # DRF + JWT
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "exams.authentication.VersionedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
 }
 
+# Cache: CACHE_BACKEND=redis (CACHE_LOCATION=redis://host:6379/0, needs the redis package) or
+# memcached (CACHE_LOCATION=host:11211, needs pymemcache) is shared by every worker on every host;
+# file is shared by the processes of one host; locmem (the default) is per process.
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "locmem")
+_CACHE_BACKENDS = {
+    "redis": ("django.core.cache.backends.redis.RedisCache", "redis://127.0.0.1:6379/0"),
+    "memcached": ("django.core.cache.backends.memcached.PyMemcacheCache", "127.0.0.1:11211"),
+    "file": ("django.core.cache.backends.filebased.FileBasedCache", str(BASE_DIR / ".cache")),
+    "locmem": ("django.core.cache.backends.locmem.LocMemCache", "ems-default"),
+}
+if CACHE_BACKEND not in _CACHE_BACKENDS:
+    raise ImproperlyConfigured(f"CACHE_BACKEND must be one of {', '.join(_CACHE_BACKENDS)}")
+CACHES = {
+    "default": {
+        "BACKEND": _CACHE_BACKENDS[CACHE_BACKEND][0],
+        "LOCATION": os.getenv("CACHE_LOCATION", _CACHE_BACKENDS[CACHE_BACKEND][1]),
+    }
+}
+# Whether every worker sees the same cache. Invalidation version keys (exams/cache.py) and
+# other cross-request state only reach all workers when it is.
+CACHE_SHARED = CACHE_BACKEND in ("redis", "memcached", "file")
+
+# Reference data (subject codes, teacher search) is also invalidated on save/delete (exams/signals.py).
+# Without a shared cache an invalidation only reaches the worker that saved, so other
+# workers may serve stale entries for up to this long: keep it short there.
+REFERENCE_CACHE_TIMEOUT = int(os.getenv("REFERENCE_CACHE_TIMEOUT", "3600" if CACHE_SHARED else "30"))
+
+# Keyset pagination for list endpoints (exams/pagination.py)
+API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", "50"))
+API_MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", "500"))
+
+# Max change-feed entries returned by one ?since= delta call (exams/delta.py)
+DELTA_SYNC_LIMIT = int(os.getenv("DELTA_SYNC_LIMIT", "1000"))
+
+# Rows fetched per server-side cursor round trip and encoded per chunk by exports (exams/exports.py)
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "2000"))
+
+# Finalized requests (and their scrutiny results) are moved to the archive tables once
+# their deadline is more than this many semesters back (manage.py archive_cold_rows)
+ARCHIVE_AFTER_SEMESTERS = int(os.getenv("ARCHIVE_AFTER_SEMESTERS", "2"))
+
+# Threads running NLP scrutiny for async uploads (exams/views_async.py)
+SCRUTINY_WORKERS = int(os.getenv("SCRUTINY_WORKERS", "2"))
+
+# Decrypted papers larger than this spill from memory to the system temp dir during finalize
+FINALIZE_SPOOL_MAX_BYTES = int(os.getenv("FINALIZE_SPOOL_MAX_BYTES", str(8 * 1024 * 1024)))
+
+# Final paper downloads (exams/downloads.py): signed URL lifetime and who sends the bytes.
+# PAPER_DOWNLOAD_MODE: "python" (Django streams, Range capable), "accel" (nginx) or "sendfile" (Apache/lighttpd)
+PAPER_DOWNLOAD_URL_TTL = int(os.getenv("PAPER_DOWNLOAD_URL_TTL", "300"))
+PAPER_DOWNLOAD_MODE = os.getenv("PAPER_DOWNLOAD_MODE", "python")
+PAPER_ACCEL_PREFIX = os.getenv("PAPER_ACCEL_PREFIX", "/protected-media/")
+
+# How long a process trusts its cached token_version (exams/authentication.py). Saves
+# refresh it immediately in the saving process; with the per-process locmem cache
+# other workers see a profile change only after this many seconds.
+TOKEN_VERSION_CACHE_TIMEOUT = int(os.getenv("TOKEN_VERSION_CACHE_TIMEOUT", "60"))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(hours=8),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
@@ -103,6 +185,8 @@ STATIC_URL = "/static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
+# Never served from MEDIA_URL (ems/urls.py); deny them in the front web server's /media/ too
+PROTECTED_MEDIA_DIRS = ("final_papers", "private_keys", "encryption_keys")
 
 # Ensure dirs exist
 os.makedirs(MEDIA_ROOT, exist_ok=True)
@@ -1,7 +1,10 @@
+import posixpath
+
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
-from django.conf.urls.static import static
+from django.http import Http404
+from django.views.static import serve
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -9,4 +12,15 @@ urlpatterns = [
     path("api/scrutiny/", include("scrutiny.urls")),  # scrutiny APIs
 ]
 
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+
+def serve_media(request, path):
+    """Dev-only media serving (like static()) that refuses PROTECTED_MEDIA_DIRS."""
+    top = posixpath.normpath(path).lstrip("/").split("/", 1)[0]
+    if top in settings.PROTECTED_MEDIA_DIRS:
+        # final papers are only reachable through signed URLs (exams/downloads.py), keys not at all
+        raise Http404
+    return serve(request, path, document_root=settings.MEDIA_ROOT)
+
+
+if settings.DEBUG:
+    urlpatterns += [re_path(rf"^{settings.MEDIA_URL.lstrip('/')}(?P<path>.*)$", serve_media)]
@@ -16,4 +16,6 @@ class CustomUserAdmin(UserAdmin):
 admin.site.register(CustomUser, CustomUserAdmin)
 admin.site.register(Request)
 admin.site.register(SubjectCode)
-admin.site.register(FinalPapers)
\ No newline at end of file
+admin.site.register(FinalPapers)
+admin.site.register(PaperRecord)
+admin.site.register(ChainCheckpoint)
@@ -0,0 +1,150 @@
+"""
+Hot/cold tiering: finalized requests whose deadline is more than N semesters
+old are moved, together with their scrutiny results, into ArchivedRequest /
+ArchivedScrutinyResult (`manage.py archive_cold_rows`).
+
+Semesters are Jan-Jun and Jul-Dec. Each batch is copied and deleted in one
+transaction, so a row is always in exactly one tier. Deleting through the ORM
+fires the usual post_delete signals: dashboard counters, the change log and
+the event stream stay in step. Question bank entries survive (SET_NULL).
+Archived summaries are compressed (exams/compression.py) and only decoded
+when read back, see ArchivedScrutinyResult.summary.
+"""
+import datetime
+import logging
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from scrutiny.models import ArchivedScrutinyResult, ScrutinyResult
+
+from .compression import compress_json
+from .models import ArchivedRequest, Request
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_STATUSES = ("Finalized",)
+
+
+def semester_start(day):
+    return datetime.date(day.year, 1 if day.month <= 6 else 7, 1)
+
+
+def cutoff_for(semesters, today=None):
+    """First day of the semester `semesters` semesters before the current one."""
+    start = semester_start(today or timezone.localdate())
+    index = start.year * 2 + (start.month > 6) - semesters
+    return datetime.date(index // 2, 7 if index % 2 else 1, 1)
+
+
+def cold_requests(cutoff):
+    return Request.objects.filter(status__in=ARCHIVE_STATUSES, deadline__lt=cutoff)
+
+
+def cold_orphan_results(cutoff):
+    """Scrutiny results not tied to any request (e.g. ad-hoc analyses)."""
+    return ScrutinyResult.objects.filter(request_obj__isnull=True, created_at__date__lt=cutoff)
+
+
+def _archived_request(req):
+    codec, payload = compress_json({
+        "syllabus": req.syllabus.name or "",
+        "q_pattern": req.q_pattern.name or "",
+        "private_key": req.private_key.name or "",
+        "enc_field": [bytes(value).hex() for value in req.enc_field or []],
+    })
+    return ArchivedRequest(
+        original_id=req.pk,
+        tusername=req.tusername,
+        teacher_id=req.teacher_id,
+        s_code=req.s_code,
+        deadline=req.deadline,
+        status=req.status,
+        total_marks=req.total_marks,
+        payload_codec=codec,
+        payload=payload,
+    )
+
+
+def _archived_result(result):
+    codec, blob = compress_json(result.summary or {})
+    return ArchivedScrutinyResult(
+        original_id=result.pk,
+        request_id=result.request_obj_id,
+        s_code=result.s_code,
+        overall_score=result.overall_score,
+        plagiarism_score=result.plagiarism_score,
+        quality_status=result.quality_status,
+        summary_codec=codec,
+        summary_blob=blob,
+        created_at=result.created_at,
+    )
+
+
+def _archive_request_batch(ids):
+    with transaction.atomic():
+        requests = list(
+            Request.objects.select_for_update().filter(id__in=ids, status__in=ARCHIVE_STATUSES)
+        )
+        ids = [r.pk for r in requests]
+        results = list(ScrutinyResult.objects.filter(request_obj_id__in=ids))
+        ArchivedRequest.objects.bulk_create([_archived_request(r) for r in requests], ignore_conflicts=True)
+        ArchivedScrutinyResult.objects.bulk_create([_archived_result(r) for r in results], ignore_conflicts=True)
+        # cascades to the scrutiny results
+        Request.objects.filter(id__in=ids).delete()
+    return len(requests), len(results)
+
+
+def _archive_orphan_batch(ids):
+    with transaction.atomic():
+        results = list(ScrutinyResult.objects.select_for_update().filter(id__in=ids, request_obj__isnull=True))
+        ArchivedScrutinyResult.objects.bulk_create([_archived_result(r) for r in results], ignore_conflicts=True)
+        ScrutinyResult.objects.filter(id__in=[r.pk for r in results]).delete()
+    return len(results)
+
+
+def archive_cold_rows(semesters, batch_size=500, dry_run=False):
+    """Move everything older than `semesters` semesters to the archive tables; returns a report."""
+    cutoff = cutoff_for(semesters)
+    report = {"cutoff": cutoff.isoformat(), "requests": 0, "scrutiny_results": 0, "dry_run": dry_run}
+    if dry_run:
+        requests = cold_requests(cutoff)
+        report["requests"] = requests.count()
+        report["scrutiny_results"] = (
+            ScrutinyResult.objects.filter(request_obj__in=requests).count() + cold_orphan_results(cutoff).count()
+        )
+        return report
+
+    while True:
+        ids = list(cold_requests(cutoff).order_by("id").values_list("id", flat=True)[:batch_size])
+        if not ids:
+            break
+        moved, results = _archive_request_batch(ids)
+        if not moved:
+            break
+        report["requests"] += moved
+        report["scrutiny_results"] += results
+
+    while True:
+        ids = list(cold_orphan_results(cutoff).order_by("id").values_list("id", flat=True)[:batch_size])
+        if not ids:
+            break
+        moved = _archive_orphan_batch(ids)
+        if not moved:
+            break
+        report["scrutiny_results"] += moved
+
+    logger.info(
+        "archive_cold_rows: cutoff=%s requests=%s scrutiny_results=%s",
+        report["cutoff"], report["requests"], report["scrutiny_results"],
+    )
+    return report
+
+
+def vacuum_hot_tables():
+    """Give the space freed by archiving back to the hot tables and their indexes."""
+    tables = [Request._meta.db_table, ScrutinyResult._meta.db_table]
+    with connection.cursor() as cursor:
+        for table in tables:
+            cursor.execute(f'VACUUM (ANALYZE) "{table}"')
+    return tables
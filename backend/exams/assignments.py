@@ -0,0 +1,124 @@
+import logging
+
+from django.db import transaction
+from django.utils.dateparse import parse_date
+
+from .delta import record_change
+from .events import publish
+from .models import ACTIVE_STATUSES, CustomUser, Request, SubjectCode
+from .signals import request_status_event
+
+logger = logging.getLogger(__name__)
+
+MAX_ASSIGNMENTS = 5000
+
+
+def _as_date(value):
+    # parse_date returns None for malformed input but raises for impossible dates like 2025-02-30
+    try:
+        return parse_date(str(value or ""))
+    except ValueError:
+        return None
+
+
+def _as_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _row_error(teacher_id, s_code, deadline, total_marks, teachers, subjects):
+    if teacher_id is None:
+        return "teacher must be a user id"
+    if not s_code or deadline is None:
+        return "s_code and deadline (YYYY-MM-DD) are required"
+    if total_marks is None or total_marks <= 0:
+        return "total_marks must be a positive integer"
+    if teacher_id not in teachers:
+        return "teacher not found"
+    subject = subjects.get(s_code)
+    if subject is None:
+        return "Subject code not found"
+    if not (subject.syllabus and subject.q_pattern):
+        return "no default syllabus and q_pattern configured for subject code"
+    return None
+
+
+def _validate(rows, teachers, subjects, busy):
+    seen = set()
+    valid, outcomes = [], []
+    for index, row in enumerate(rows):
+        if not isinstance(row, dict):
+            outcomes.append({"index": index, "status": "error", "detail": "row must be an object"})
+            continue
+        teacher_id = _as_int(row.get("teacher"))
+        s_code = str(row.get("s_code") or "").strip()
+        deadline = _as_date(row.get("deadline"))
+        total_marks = _as_int(row.get("total_marks", 100))
+
+        error = _row_error(teacher_id, s_code, deadline, total_marks, teachers, subjects)
+        if not error and (teacher_id, s_code) in busy:
+            error = "teacher already has an active request for this subject code"
+        if not error and (teacher_id, s_code) in seen:
+            error = "duplicate row"
+        if error:
+            outcomes.append({"index": index, "status": "error", "detail": error})
+            continue
+        seen.add((teacher_id, s_code))
+        valid.append((index, teachers[teacher_id], subjects[s_code], deadline, total_marks))
+    return valid, outcomes
+
+
+def assign_requests(rows):
+    """
+    Create Pending requests for many (teacher, s_code, deadline, total_marks)
+    rows. Teachers, subject codes and already-active pairs are each looked up
+    with one query; every created request shares the subject's default
+    syllabus/q_pattern files by name. Returns a per-row report.
+    """
+    dict_rows = [row for row in rows if isinstance(row, dict)]
+    teacher_ids = {_as_int(row.get("teacher")) for row in dict_rows} - {None}
+    codes = {str(row.get("s_code") or "").strip() for row in dict_rows}
+
+    teachers = CustomUser.objects.only("id", "username").in_bulk(teacher_ids)
+    subjects = {}
+    for subject in SubjectCode.objects.filter(s_code__in=codes).order_by("-id"):
+        subjects.setdefault(subject.s_code, subject)
+    busy = set(
+        Request.objects.filter(teacher_id__in=teacher_ids, s_code__in=codes, status__in=ACTIVE_STATUSES)
+        .values_list("teacher_id", "s_code")
+    )
+    valid, outcomes = _validate(rows, teachers, subjects, busy)
+
+    created = []
+    if valid:
+        objs = [
+            Request(
+                tusername=teacher.username,
+                teacher=teacher,
+                s_code=subject.s_code,
+                syllabus=subject.syllabus.name,
+                q_pattern=subject.q_pattern.name,
+                deadline=deadline,
+                status="Pending",
+                total_marks=total_marks,
+            )
+            for _index, teacher, subject, deadline, total_marks in valid
+        ]
+        with transaction.atomic():
+            created = Request.objects.bulk_create(objs)
+            # bulk_create sends no post_save: feed the change log and event stream here
+            record_change("exams.request", [r.pk for r in created])
+            for r in created:
+                publish(request_status_event(r))
+        for (index, *_rest), r in zip(valid, created):
+            outcomes.append({"index": index, "status": "created", "request_id": r.pk})
+
+    report = {
+        "created": len(created),
+        "errors": len(outcomes) - len(created),
+        "rows": sorted(outcomes, key=lambda o: o["index"]),
+    }
+    logger.info("assign_requests: created=%s errors=%s", report["created"], report["errors"])
+    return report
@@ -0,0 +1,106 @@
+"""
+JWT authentication for the API.
+
+Tokens are issued by ProfileRefreshToken and carry the user's role, profile
+(course/semester/branch/subject), teacher_id and token_version. Two
+authentication classes read them:
+
+  VersionedJWTAuthentication - the default; loads the CustomUser row as
+      simplejwt does and rejects tokens older than the user's token_version.
+  ClaimsJWTAuthentication - for hot read endpoints; request.user is a
+      TokenUser built from the claims and no user row is loaded. The version
+      check goes through the cache (TOKEN_VERSION_CACHE_TIMEOUT). Views using
+      it must compare ids (teacher_id=request.user.id) rather than hand
+      request.user to the ORM.
+
+CustomUser.save() bumps token_version whenever a claimed field or is_active
+changes, so tokens carrying the old values (or issued before a deactivation)
+stop working. Inactive users have no current version at all.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework_simplejwt.authentication import JWTAuthentication, JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, AuthenticationFailed, TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+VERSION_CLAIM = "ver"
+
+
+class ProfileRefreshToken(RefreshToken):
+    """Refresh token whose access tokens carry the profile claims and token version."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[VERSION_CLAIM] = user.token_version
+        token["username"] = user.username
+        for name in user.CLAIM_FIELDS:
+            token[name] = getattr(user, name)
+        return token
+
+
+def _version_key(user_id):
+    return f"ems:tokver:{user_id}"
+
+
+def remember_token_version(user_id, version):
+    cache.set(_version_key(user_id), version, settings.TOKEN_VERSION_CACHE_TIMEOUT)
+
+
+def forget_token_version(user_id):
+    cache.delete(_version_key(user_id))
+
+
+def current_token_version(user_id):
+    """token_version for user_id from the cache, falling back to one indexed lookup; None if no such active user."""
+    version = cache.get(_version_key(user_id))
+    if version is None:
+        version = (
+            get_user_model().objects.filter(pk=user_id, is_active=True)
+            .values_list("token_version", flat=True).first()
+        )
+        if version is not None:
+            remember_token_version(user_id, version)
+    return version
+
+
+class VersionedJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        # tokens issued before claims existed carry no version and are left alone
+        if VERSION_CLAIM in validated_token and validated_token[VERSION_CLAIM] != user.token_version:
+            raise InvalidToken("Token predates a profile change; sign in again")
+        return user
+
+
+class ClaimsJWTAuthentication(JWTStatelessUserAuthentication):
+    def get_user(self, validated_token):
+        if VERSION_CLAIM not in validated_token:
+            return VersionedJWTAuthentication().get_user(validated_token)
+        version = current_token_version(validated_token[api_settings.USER_ID_CLAIM])
+        if version is None:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        if validated_token[VERSION_CLAIM] != version:
+            raise InvalidToken("Token predates a profile change; sign in again")
+        return super().get_user(validated_token)
+
+
+def authenticate_request(request, allow_query_token=False):
+    """
+    Resolve the user for a plain (non-DRF) Django view from the simplejwt
+    access token in the Authorization header, or from ?token= when the
+    client cannot send headers (EventSource). Returns None if unauthenticated.
+    """
+    auth = VersionedJWTAuthentication()
+    raw = request.GET.get("token") if allow_query_token else None
+    if not raw:
+        header = auth.get_header(request)
+        raw = auth.get_raw_token(header) if header else None
+    if not raw:
+        return None
+    try:
+        return auth.get_user(auth.get_validated_token(raw))
+    except (InvalidToken, AuthenticationFailed, TokenError):
+        return None
@@ -1,40 +1,112 @@
-import json, os
+import json, os, threading, time
+import requests
 from web3 import Web3
 from django.conf import settings
 
 ABI_PATH = os.path.join(os.path.dirname(__file__), "contract_abi.json")
 ADDR_PATH = os.path.join(os.path.dirname(__file__), "contract_address.txt")
 
-def _web3():
-    return Web3(Web3.HTTPProvider(settings.RPC_URL))
 
-def _account(w3: Web3):
-    return w3.eth.account.from_key(settings.PRIVATE_KEY)
+def _mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+class ChainClient:
+    """
+    Process-wide chain handle. The ABI, contract, account and a keep-alive
+    HTTP session are built once and reused until the ABI/address files change
+    on disk (e.g. after scripts/deploy_contract.py) or the RPC settings change.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = None
+        self._fingerprint = None
+        self.stats = {"cold_loads": 0, "warm_hits": 0, "cold_seconds": 0.0, "warm_seconds": 0.0}
+
+    def _current_fingerprint(self):
+        return (_mtime(ABI_PATH), _mtime(ADDR_PATH), settings.RPC_URL, settings.PRIVATE_KEY)
+
+    def _build(self):
+        with open(ABI_PATH, "r") as f:
+            abi = json.load(f)
+        with open(ADDR_PATH, "r") as f:
+            address = f.read().strip()
+        session = requests.Session()
+        w3 = Web3(Web3.HTTPProvider(settings.RPC_URL, session=session))
+        contract = w3.eth.contract(address=Web3.to_checksum_address(address), abi=abi)
+        account = w3.eth.account.from_key(settings.PRIVATE_KEY)
+        return {"w3": w3, "account": account, "contract": contract, "abi": abi, "session": session}
+
+    def get(self):
+        """Return (w3, account, contract), or (None, None, None) if not deployed."""
+        started = time.perf_counter()
+        fingerprint = self._current_fingerprint()
+        if fingerprint[0] is None or fingerprint[1] is None:
+            return None, None, None
+
+        state = self._state
+        if state is not None and fingerprint == self._fingerprint:
+            self.stats["warm_hits"] += 1
+            self.stats["warm_seconds"] += time.perf_counter() - started
+            return state["w3"], state["account"], state["contract"]
+
+        with self._lock:
+            if self._state is None or fingerprint != self._fingerprint:
+                old = self._state
+                self._state = self._build()
+                self._fingerprint = fingerprint
+                if old is not None:
+                    old["session"].close()
+                self.stats["cold_loads"] += 1
+                self.stats["cold_seconds"] += time.perf_counter() - started
+            else:
+                self.stats["warm_hits"] += 1
+                self.stats["warm_seconds"] += time.perf_counter() - started
+            state = self._state
+        return state["w3"], state["account"], state["contract"]
+
+    def reset(self):
+        with self._lock:
+            if self._state is not None:
+                self._state["session"].close()
+            self._state = None
+            self._fingerprint = None
+
+    def timing(self):
+        """Counters plus average warm/cold load time in milliseconds."""
+        s = dict(self.stats)
+        s["avg_cold_ms"] = round(s["cold_seconds"] * 1000 / s["cold_loads"], 3) if s["cold_loads"] else 0.0
+        s["avg_warm_ms"] = round(s["warm_seconds"] * 1000 / s["warm_hits"], 3) if s["warm_hits"] else 0.0
+        return s
+
+
+_client = ChainClient()
+
+
+def get_client() -> ChainClient:
+    return _client
+
 
 def load_contract():
-    if not os.path.exists(ABI_PATH) or not os.path.exists(ADDR_PATH):
-        return None, None, None
-    with open(ABI_PATH, "r") as f:
-        abi = json.load(f)
-    with open(ADDR_PATH, "r") as f:
-        address = f.read().strip()
-    w3 = _web3()
-    contract = w3.eth.contract(address=Web3.to_checksum_address(address), abi=abi)
-    account = _account(w3)
-    return w3, account, contract
+    return _client.get()
+
 
 def record_cid(s_code: str, cid: str):
     w3, acct, contract = load_contract()
     if contract is None:
         return None
-    nonce = w3.eth.get_transaction_count(acct.address)
+    nonce = w3.eth.get_transaction_count(acct.address, "pending")
     tx = contract.functions.recordPaper(s_code, cid).build_transaction({
         "from": acct.address,
         "nonce": nonce,
         "gas": 1_500_000,
         "gasPrice": w3.to_wei("1", "gwei"),
     })
-    signed = w3.eth.account.sign_transaction(tx, private_key=settings.PRIVATE_KEY)
+    signed = acct.sign_transaction(tx)
     tx_hash = w3.eth.send_raw_transaction(signed.raw_transaction)
     receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
     return receipt.transactionHash.hex()
@@ -0,0 +1,195 @@
+"""
+Streaming ZIP bundles of final papers.
+
+The archive is written by hand rather than with zipfile so that its layout
+is fully deterministic: every member is STORED with a data descriptor and a
+fixed timestamp, and the manifest has fixed-width hash fields. The exact
+length is therefore known before any file is read (Content-Length), and a
+Range request can start anywhere: members before the range are read only to
+recompute their CRC/SHA-256 for the central directory and manifest, not sent.
+Memory use is one read chunk regardless of bundle size.
+"""
+import hashlib
+import json
+import re
+import struct
+import zlib
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+
+from .downloads import _parse_range
+
+CHUNK_SIZE = 64 * 1024
+MANIFEST_NAME = "manifest.json"
+
+_DOS_DATE = (0 << 9) | (1 << 5) | 1  # 1980-01-01, fixed so the bytes never change
+_FLAGS = 0x0808  # data descriptor follows the data; names are UTF-8
+_ZIP32_LIMIT = 0xFFFFFFFF
+_MAX_MEMBERS = 0xFFFF
+
+
+class BundleTooLarge(ValueError):
+    pass
+
+
+def _safe(part):
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", str(part)) or "_"
+
+
+def _local_header(name):
+    return struct.pack("<IHHHHHIIIHH", 0x04034B50, 20, _FLAGS, 0, 0, _DOS_DATE, 0, 0, 0, len(name), 0) + name
+
+
+def _descriptor(crc, size):
+    return struct.pack("<IIII", 0x08074B50, crc, size, size)
+
+
+def _central_header(name, crc, size, offset):
+    return struct.pack(
+        "<IHHHHHHIIIHHHHHII",
+        0x02014B50, 20, 20, _FLAGS, 0, 0, _DOS_DATE, crc, size, size, len(name), 0, 0, 0, 0, 0, offset,
+    ) + name
+
+
+def _member_len(name, size):
+    return 30 + len(name) + size + 16
+
+
+class Bundle:
+    """Layout of one bundle: the papers in order plus the trailing manifest."""
+
+    def __init__(self, papers):
+        self.members = []
+        for fp in papers:
+            arcname = f"{_safe(fp.course)}/{_safe(fp.semester)}/{_safe(fp.branch)}/{_safe(fp.s_code)}-{fp.id}.pdf"
+            self.members.append({
+                "fp": fp,
+                "name": arcname.encode("utf-8"),
+                "size": fp.paper.size,
+            })
+        if len(self.members) + 1 > _MAX_MEMBERS:
+            raise BundleTooLarge("too many papers for one bundle")
+
+        self.manifest_len = len(self._manifest(["0" * 64] * len(self.members)))
+        manifest_name = MANIFEST_NAME.encode()
+        body = sum(_member_len(m["name"], m["size"]) for m in self.members)
+        body += _member_len(manifest_name, self.manifest_len)
+        self.central_len = sum(46 + len(m["name"]) for m in self.members) + 46 + len(manifest_name)
+        self.central_offset = body
+        self.size = body + self.central_len + 22
+        if self.size > _ZIP32_LIMIT:
+            raise BundleTooLarge("bundle exceeds 4 GiB")
+
+        key = "|".join(f"{m['fp'].id}:{m['fp'].paper.name}:{m['size']}" for m in self.members)
+        self.etag = '"' + hashlib.sha1(key.encode()).hexdigest() + '"'
+
+    def _manifest(self, hashes):
+        papers = [
+            {
+                "name": m["name"].decode(),
+                "id": m["fp"].id,
+                "s_code": m["fp"].s_code,
+                "cid": m["fp"].cid,
+                "size": m["size"],
+                "sha256": digest,
+            }
+            for m, digest in zip(self.members, hashes)
+        ]
+        return json.dumps({"algorithm": "sha256", "papers": papers}, indent=1).encode()
+
+    def iter_bytes(self, start=0, end=None):
+        """Yield archive bytes start..end (inclusive)."""
+        end = self.size - 1 if end is None else end
+        pos = 0
+        central = []
+        hashes = []
+
+        def window(piece):
+            lo, hi = max(start - pos, 0), min(end + 1 - pos, len(piece))
+            return piece[lo:hi] if lo < hi else b""
+
+        def member(name, size, chunks):
+            nonlocal pos
+            offset = pos
+            header = _local_header(name)
+            out = window(header)
+            if out:
+                yield out
+            pos += len(header)
+            crc, sha = 0, hashlib.sha256()
+            for chunk in chunks:
+                crc = zlib.crc32(chunk, crc)
+                sha.update(chunk)
+                out = window(chunk)
+                if out:
+                    yield out
+                pos += len(chunk)
+            if pos != offset + len(header) + size:
+                raise IOError(f"{name.decode()} changed size while bundling")
+            trailer = _descriptor(crc, size)
+            out = window(trailer)
+            if out:
+                yield out
+            pos += len(trailer)
+            central.append(_central_header(name, crc, size, offset))
+            hashes.append(sha.hexdigest())
+
+        for m in self.members:
+            if pos > end:
+                return
+            yield from member(m["name"], m["size"], self._read(m["fp"]))
+        if pos > end:
+            return
+        manifest = self._manifest(hashes)
+        yield from member(MANIFEST_NAME.encode(), len(manifest), [manifest])
+
+        count = len(central)
+        tail = b"".join(central) + struct.pack(
+            "<IHHHHIIH", 0x06054B50, 0, 0, count, count, self.central_len, self.central_offset, 0
+        )
+        out = window(tail)
+        if out:
+            yield out
+
+    @staticmethod
+    def _read(fp):
+        with fp.paper.storage.open(fp.paper.name, "rb") as f:
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+
+
+def bundle_response(request, papers, filename):
+    bundle = Bundle(papers)
+
+    conditional = get_conditional_response(request, etag=bundle.etag)
+    if conditional is not None:
+        conditional["ETag"] = bundle.etag
+        return conditional
+
+    byte_range = None
+    range_header = request.headers.get("Range")
+    if range_header and request.headers.get("If-Range", bundle.etag) == bundle.etag:
+        byte_range = _parse_range(range_header, bundle.size)
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{bundle.size}"
+        return response
+
+    if byte_range is None:
+        response = StreamingHttpResponse(bundle.iter_bytes(), content_type="application/zip")
+        response["Content-Length"] = str(bundle.size)
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(bundle.iter_bytes(start, end), status=206, content_type="application/zip")
+        response["Content-Range"] = f"bytes {start}-{end}/{bundle.size}"
+        response["Content-Length"] = str(end - start + 1)
+
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = bundle.etag
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    response["Cache-Control"] = "private, no-store"
+    return response
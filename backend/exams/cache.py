@@ -0,0 +1,104 @@
+"""
+Versioned reference-data cache. invalidate() bumps a namespace version key
+in the default cache; the bump only reaches other workers when that cache
+is shared (CACHE_BACKEND=redis/memcached/file, settings.CACHE_SHARED).
+With the per-process locmem default, other workers keep serving their own
+entries until REFERENCE_CACHE_TIMEOUT (30s there) runs out.
+"""
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+_MISSING = object()
+_stats_lock = threading.Lock()
+_stats = {}
+
+SUBJECT_CODES = "subject_codes"
+TEACHERS = "teachers"
+
+
+def _version_key(namespace):
+    return f"ems:ns:{namespace}"
+
+
+def _version(namespace):
+    version = cache.get(_version_key(namespace))
+    if version is None:
+        # Start from the clock, not 1, so an evicted version key can never
+        # make old entries reachable again.
+        cache.add(_version_key(namespace), int(time.time() * 1000), None)
+        version = cache.get(_version_key(namespace))
+    return version
+
+
+def _record(namespace, hit):
+    with _stats_lock:
+        s = _stats.setdefault(namespace, {"hits": 0, "misses": 0})
+        s["hits" if hit else "misses"] += 1
+
+
+def cached(namespace, key, producer, timeout=None):
+    """
+    Return the cached value for (namespace, key), calling producer() on a miss.
+    Entries are keyed by the namespace version, so invalidate(namespace) drops
+    all of them at once without scanning the cache.
+    """
+    digest = hashlib.md5(repr(key).encode("utf-8")).hexdigest()
+    full_key = f"ems:{namespace}:{_version(namespace)}:{digest}"
+    value = cache.get(full_key, _MISSING)
+    if value is _MISSING:
+        _record(namespace, False)
+        value = producer()
+        cache.set(full_key, value, timeout if timeout is not None else settings.REFERENCE_CACHE_TIMEOUT)
+    else:
+        _record(namespace, True)
+    return value
+
+
+def invalidate(namespace):
+    try:
+        cache.incr(_version_key(namespace))
+    except ValueError:
+        cache.set(_version_key(namespace), int(time.time() * 1000), None)
+
+
+def stats():
+    """Per-namespace hit/miss counters for this process."""
+    with _stats_lock:
+        out = {}
+        for namespace, s in _stats.items():
+            total = s["hits"] + s["misses"]
+            out[namespace] = dict(s, hit_ratio=round(s["hits"] / total, 3) if total else 0.0)
+        return out
+
+
+# ---- cached lookups ----
+
+def subject_code_list():
+    from .models import SubjectCode
+    return cached(SUBJECT_CODES, "list", lambda: list(SubjectCode.objects.values("id", "s_code", "subject")))
+
+
+def subject_code_by_code(s_code):
+    from .models import SubjectCode
+    return cached(SUBJECT_CODES, ("s_code", s_code), lambda: SubjectCode.objects.filter(s_code=s_code).first())
+
+
+def subject_code_by_subject(subject):
+    from .models import SubjectCode
+    return cached(SUBJECT_CODES, ("subject", subject), lambda: SubjectCode.objects.filter(subject=subject).first())
+
+
+def teachers_for_profile(course, semester, branch, subject):
+    from .models import CustomUser
+    return cached(
+        TEACHERS,
+        (course, semester, branch, subject),
+        lambda: list(
+            CustomUser.objects.filter(course=course, semester=semester, branch=branch, subject=subject)
+            .values('id', 'username', 'first_name', 'last_name', 'teacher_id')
+        ),
+    )
@@ -0,0 +1,111 @@
+import logging
+
+from django.db import transaction
+from web3 import Web3
+
+from .blockchain import load_contract
+from .models import PaperRecord, ChainCheckpoint, SubjectCode, Request, FinalPapers
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 2000
+EVENT_SIGNATURE = "PaperRecorded(string,string,address)"
+
+
+def s_code_topic(s_code: str) -> str:
+    """Topic value the contract emits for the indexed s_code argument."""
+    return Web3.to_hex(Web3.keccak(text=s_code))
+
+
+def _known_s_codes():
+    codes = set(SubjectCode.objects.values_list("s_code", flat=True))
+    codes.update(Request.objects.values_list("s_code", flat=True).distinct())
+    codes.update(FinalPapers.objects.values_list("s_code", flat=True).distinct())
+    return {s_code_topic(c): c for c in codes if c}
+
+
+def sync_paper_events(batch_size=DEFAULT_BATCH_SIZE, confirmations=0):
+    """
+    Pull PaperRecorded logs from the last checkpoint up to the chain head in
+    block-range batches. Each batch is stored together with the checkpoint
+    advance, so an interrupted run resumes where it stopped.
+    Returns the number of new rows stored.
+    """
+    w3, _acct, contract = load_contract()
+    if contract is None:
+        logger.info("sync_paper_events: contract not deployed, nothing to index")
+        return 0
+
+    address = contract.address
+    checkpoint, _ = ChainCheckpoint.objects.get_or_create(name=f"PaperRecorded:{address}")
+    head = w3.eth.block_number - confirmations
+    start = checkpoint.last_block + 1
+    if start > head:
+        return 0
+
+    topic0 = Web3.to_hex(Web3.keccak(text=EVENT_SIGNATURE))
+    event = contract.events.PaperRecorded()
+    known = _known_s_codes()
+    stored = 0
+
+    while start <= head:
+        end = min(start + batch_size - 1, head)
+        logs = w3.eth.get_logs({
+            "address": address,
+            "topics": [topic0],
+            "fromBlock": start,
+            "toBlock": end,
+        })
+        rows = []
+        for log in logs:
+            decoded = event.process_log(log)
+            code_hash = Web3.to_hex(decoded["args"]["s_code"])
+            rows.append(PaperRecord(
+                s_code_hash=code_hash,
+                s_code=known.get(code_hash, ""),
+                cid=decoded["args"]["cid"],
+                uploader=decoded["args"]["uploader"],
+                contract_address=address,
+                block_number=log["blockNumber"],
+                tx_hash=Web3.to_hex(log["transactionHash"]),
+                log_index=log["logIndex"],
+            ))
+        with transaction.atomic():
+            PaperRecord.objects.bulk_create(rows, ignore_conflicts=True)
+            ChainCheckpoint.objects.filter(pk=checkpoint.pk).update(last_block=end)
+        logger.debug("sync_paper_events: blocks %s-%s -> %s events", start, end, len(rows))
+        stored += len(rows)
+        start = end + 1
+
+    return stored
+
+
+def verify_s_codes(s_codes):
+    """
+    Compare the CID stored for each finalized paper with the indexed on-chain
+    history. The whole history for all codes is fetched with one query.
+    """
+    hashes = {s_code_topic(c): c for c in s_codes}
+    history = {c: [] for c in s_codes}
+    records = PaperRecord.objects.filter(s_code_hash__in=hashes.keys()).order_by("block_number", "log_index").values(
+        "s_code_hash", "cid", "uploader", "block_number", "tx_hash"
+    )
+    for rec in records:
+        history[hashes[rec.pop("s_code_hash")]].append(rec)
+
+    finals = {}
+    for fp in FinalPapers.objects.filter(s_code__in=s_codes).order_by("id").values("s_code", "cid"):
+        finals[fp["s_code"]] = fp["cid"]
+
+    results = []
+    for code in s_codes:
+        cids = [h["cid"] for h in history[code]]
+        final_cid = finals.get(code) or None
+        results.append({
+            "s_code": code,
+            "final_cid": final_cid,
+            "latest_chain_cid": cids[-1] if cids else None,
+            "verified": bool(final_cid) and final_cid in cids,
+            "history": history[code],
+        })
+    return results
@@ -0,0 +1,46 @@
+"""
+Compression for archived JSON documents (exams/archive.py).
+
+zstd (the optional `zstandard` package) is used when installed, otherwise
+zlib. The codec is stored next to every blob, so rows written with either
+one stay readable whichever is installed later, as long as a zstd row is
+only read where zstandard is available.
+"""
+import json
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+ZSTD_LEVEL = 10
+ZLIB_LEVEL = 9
+
+
+def default_codec():
+    return "zstd" if zstandard is not None else "zlib"
+
+
+def compress_json(document, codec=None):
+    """(codec, bytes) for a JSON-serializable document."""
+    codec = codec or default_codec()
+    raw = json.dumps(document, separators=(",", ":")).encode("utf-8")
+    if codec == "zstd":
+        return codec, zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    if codec == "zlib":
+        return codec, zlib.compress(raw, ZLIB_LEVEL)
+    raise ValueError(f"unknown codec '{codec}'")
+
+
+def decompress_json(codec, blob):
+    blob = bytes(blob)
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("this row was archived with zstd; install zstandard to read it")
+        raw = zstandard.ZstdDecompressor().decompress(blob)
+    elif codec == "zlib":
+        raw = zlib.decompress(blob)
+    else:
+        raise ValueError(f"unknown codec '{codec}'")
+    return json.loads(raw)
@@ -0,0 +1,104 @@
+import hashlib
+
+from django.conf import settings
+from django.db import connection, transaction
+from rest_framework.response import Response
+
+from .models import ChangeLogEntry
+
+# pg_advisory_xact_lock key taken by every change-log insert (any fixed bigint)
+CHANGELOG_LOCK_ID = 7_301_937
+
+
+
+def record_change(model_label, object_ids, deleted=False):
+    """
+    Append change-feed rows once the surrounding transaction commits, so
+    rolled-back writes never show up in a delta.
+
+    Inserts are serialized by an advisory lock held until they commit, so ids
+    become visible in id order: a reader that has seen cursor N can never
+    later find a committed entry below N (with plain concurrent inserts a
+    lower id could commit after a higher one and be skipped for good).
+    """
+    object_ids = list(object_ids)
+    if not object_ids:
+        return
+
+    def _write():
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_xact_lock(%s)", [CHANGELOG_LOCK_ID])
+            ChangeLogEntry.objects.bulk_create(
+                [ChangeLogEntry(model=model_label, object_id=pk, deleted=deleted) for pk in object_ids]
+            )
+
+    transaction.on_commit(_write)
+
+
+def current_cursor(model_label):
+    last = ChangeLogEntry.objects.filter(model=model_label).order_by("-id").values_list("id", flat=True)[:1]
+    return last[0] if last else 0
+
+
+def _etag(request, model_label, cursor, salt=""):
+    # the same cursor + query string (+ salt) always yields the same representation
+    digest = hashlib.sha1((request.get_full_path() + salt).encode("utf-8")).hexdigest()[:16]
+    return f'"{model_label}-{cursor}-{digest}"'
+
+
+def _etag_matches(request, etag):
+    header = request.META.get("HTTP_IF_NONE_MATCH", "")
+    if not header:
+        return False
+    candidates = [c.strip() for c in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def _delta(model_label, since, queryset, serialize):
+    limit = getattr(settings, "DELTA_SYNC_LIMIT", 1000)
+    entries = list(
+        ChangeLogEntry.objects.filter(model=model_label, id__gt=since)
+        .order_by("id")
+        .values_list("id", "object_id")[: limit + 1]
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    touched = list(dict.fromkeys(object_id for _id, object_id in entries))
+    rows = list(queryset.filter(pk__in=touched)) if touched else []
+    present = {row.pk for row in rows}
+    return {
+        "cursor": entries[-1][0] if entries else since,
+        "has_more": has_more,
+        "changed": serialize(rows),
+        # deleted, or no longer part of this list (e.g. a request that was finalized)
+        "deleted": [pk for pk in touched if pk not in present],
+    }
+
+
+def sync_response(request, model_label, queryset, serialize, full, etag_salt=""):
+    """
+    Shared polling logic for list endpoints:
+      - If-None-Match with the current ETag -> 304, no list query at all
+      - ?since=<cursor> -> only rows changed after that cursor, plus removed ids
+      - otherwise -> full(), the normal (paginated) list
+    The current cursor is returned in X-Change-Cursor either way. etag_salt
+    covers representation changes the change log does not see.
+    """
+    cursor = current_cursor(model_label)
+    etag = _etag(request, model_label, cursor, etag_salt)
+    if _etag_matches(request, etag):
+        return Response(status=304, headers={"ETag": etag, "X-Change-Cursor": str(cursor)})
+
+    since = request.query_params.get("since")
+    if since is not None:
+        try:
+            since = int(since)
+        except ValueError:
+            return Response({"detail": "since must be an integer cursor"}, status=400)
+        response = Response(_delta(model_label, since, queryset, serialize))
+    else:
+        response = full()
+    response["ETag"] = etag
+    response["X-Change-Cursor"] = str(cursor)
+    return response
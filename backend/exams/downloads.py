@@ -0,0 +1,163 @@
+"""
+Final paper downloads through short-lived signed URLs.
+
+decrypt-info hands out a URL carrying a TimestampSigner token instead of the
+raw media URL. The download view only checks the token and then, depending
+on PAPER_DOWNLOAD_MODE, hands the transfer to the front web server:
+
+  "accel"    - nginx X-Accel-Redirect to an internal location, e.g.
+                   location /protected-media/ { internal; alias <MEDIA_ROOT>/; }
+  "sendfile" - Apache mod_xsendfile / lighttpd X-Sendfile with the absolute path
+  "python"   - streamed by Django, with Range, If-Range and conditional
+               (ETag / Last-Modified) support
+
+In the first two modes the worker is free as soon as the headers are sent;
+the web server also takes care of Range and conditional requests.
+"""
+import mimetypes
+import os
+import re
+import time
+
+from django.conf import settings
+from django.core import signing
+from django.http import FileResponse, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_http_methods
+
+from .models import FinalPapers
+
+SIGNING_SALT = "exams.final-paper-download"
+CHUNK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+_signer = signing.TimestampSigner(salt=SIGNING_SALT)
+
+
+def signed_download_url(request, paper):
+    token = _signer.sign(str(paper.id))
+    path = reverse("final-paper-download", args=[paper.id])
+    return request.build_absolute_uri(f"{path}?token={token}")
+
+
+def url_epoch():
+    """Changes every half URL lifetime; list ETags include it so a 304 never revives expired links."""
+    return int(time.time()) // max(settings.PAPER_DOWNLOAD_URL_TTL // 2, 1)
+
+
+def _token_matches(token, paper_id):
+    try:
+        value = _signer.unsign(token, max_age=settings.PAPER_DOWNLOAD_URL_TTL)
+    except signing.BadSignature:  # also covers SignatureExpired
+        return False
+    return value == str(paper_id)
+
+
+def _base_headers(response, filename, content_type):
+    response["Content-Type"] = content_type
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    response["Cache-Control"] = "private, no-store"
+    return response
+
+
+def _parse_range(header, size):
+    """(start, end) inclusive for a single byte range, None to ignore, False if unsatisfiable."""
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        # multi-range and malformed headers are ignored; a full 200 is always valid
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _iter_range(path, start, length):
+    with open(path, "rb") as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def _python_response(request, path, filename, content_type):
+    stat = os.stat(path)
+    size = stat.st_size
+    etag = f'"{size:x}-{int(stat.st_mtime):x}"'
+    last_modified = http_date(stat.st_mtime)
+
+    conditional = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if conditional is not None:  # 304 or 412
+        conditional["ETag"] = etag
+        return conditional
+
+    byte_range = None
+    range_header = request.headers.get("Range")
+    if range_header and request.method == "GET":
+        if_range = request.headers.get("If-Range")
+        fresh = (
+            if_range is None
+            or if_range == etag
+            or parse_http_date_safe(if_range) == int(stat.st_mtime)
+        )
+        if fresh:
+            byte_range = _parse_range(range_header, size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+
+    if byte_range is None:
+        response = FileResponse(open(path, "rb"))
+        response["Content-Length"] = str(size)
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(_iter_range(path, start, end - start + 1), status=206)
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = str(end - start + 1)
+
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Last-Modified"] = last_modified
+    return _base_headers(response, filename, content_type)
+
+
+@require_http_methods(["GET", "HEAD"])
+def download_final_paper(request, paper_id):
+    if not _token_matches(request.GET.get("token", ""), paper_id):
+        return JsonResponse({"detail": "Download link is invalid or has expired"}, status=403)
+    fp = FinalPapers.objects.filter(id=paper_id).only("id", "s_code", "paper").first()
+    if not fp or not fp.paper:
+        return JsonResponse({"detail": "Not found"}, status=404)
+
+    filename = os.path.basename(fp.paper.name)
+    content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    mode = settings.PAPER_DOWNLOAD_MODE
+
+    if mode == "accel":
+        response = HttpResponse()
+        response["X-Accel-Redirect"] = settings.PAPER_ACCEL_PREFIX.rstrip("/") + "/" + fp.paper.name
+        return _base_headers(response, filename, content_type)
+    if mode == "sendfile":
+        response = HttpResponse()
+        response["X-Sendfile"] = fp.paper.path
+        return _base_headers(response, filename, content_type)
+
+    if not os.path.exists(fp.paper.path):
+        return JsonResponse({"detail": "Not found"}, status=404)
+    return _python_response(request, fp.paper.path, filename, content_type)
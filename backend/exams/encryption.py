@@ -1,6 +1,10 @@
-from cryptography.fernet import Fernet
+from cryptography.exceptions import InvalidSignature
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes, hmac, padding
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from django.conf import settings
-from django.core.files import File
+import base64
+import binascii
 import os
 
 def encrypt_file(paper):
@@ -20,17 +24,68 @@ def encrypt_file(paper):
 	return key
 
 
-def decrypt_file(paper,key,s_code):
-	
-	fernet = Fernet(key)
-	paper = paper.text.encode('utf-8')
+class FernetStreamDecryptor:
+	"""
+	Incremental Fernet decryption (version | timestamp | IV | ciphertext | HMAC,
+	url-safe base64). Feed token text to update() as it arrives and write out
+	what it returns; the HMAC is only checked in finalize(), so that output
+	must be discarded if finalize() raises InvalidToken.
+	"""
+
+	HEADER_LEN = 25
+	HMAC_LEN = 32
+
+	def __init__(self, key):
+		raw = base64.urlsafe_b64decode(key)
+		if len(raw) != 32:
+			raise ValueError("Fernet key must be 32 url-safe base64-encoded bytes.")
+		self._hmac = hmac.HMAC(raw[:16], hashes.SHA256())
+		self._aes_key = raw[16:]
+		self._b64 = b""
+		self._buf = b""
+		self._decryptor = None
+		self._unpadder = padding.PKCS7(algorithms.AES.block_size).unpadder()
+		self.bytes_in = 0
+		self.bytes_out = 0
+		self.peak_buffer = 0
+
+	def update(self, chunk):
+		self.bytes_in += len(chunk)
+		self._b64 += chunk
+		cut = len(self._b64) - len(self._b64) % 4
+		try:
+			self._buf += base64.urlsafe_b64decode(self._b64[:cut])
+		except (binascii.Error, ValueError):
+			raise InvalidToken
+		self._b64 = self._b64[cut:]
 
-	decrypted = fernet.decrypt(paper)
-	
-	with open('media/'+s_code+'.pdf','wb') as f:
-		f.write(decrypted)
+		out = b""
+		if self._decryptor is None and len(self._buf) >= self.HEADER_LEN:
+			header, self._buf = self._buf[:self.HEADER_LEN], self._buf[self.HEADER_LEN:]
+			if header[0] != 0x80:
+				raise InvalidToken
+			self._hmac.update(header)
+			self._decryptor = Cipher(algorithms.AES(self._aes_key), modes.CBC(header[9:])).decryptor()
+		if self._decryptor is not None and len(self._buf) > self.HMAC_LEN:
+			# the trailing 32 bytes may be the HMAC, so they are held back
+			body, self._buf = self._buf[:-self.HMAC_LEN], self._buf[-self.HMAC_LEN:]
+			self._hmac.update(body)
+			out = self._unpadder.update(self._decryptor.update(body))
 
-	file_ = open('media/'+s_code+'.pdf','rb')
-	f_file = File(file_)
+		self.peak_buffer = max(self.peak_buffer, len(chunk) + len(self._b64) + len(self._buf) + len(out))
+		self.bytes_out += len(out)
+		return out
 
-	return f_file
\ No newline at end of file
+	def finalize(self):
+		if self._b64 or self._decryptor is None or len(self._buf) != self.HMAC_LEN:
+			raise InvalidToken
+		try:
+			self._hmac.verify(self._buf)
+		except InvalidSignature:
+			raise InvalidToken
+		try:
+			out = self._unpadder.update(self._decryptor.finalize()) + self._unpadder.finalize()
+		except ValueError:
+			raise InvalidToken
+		self.bytes_out += len(out)
+		return out
@@ -0,0 +1,177 @@
+"""
+Server-Sent Events for Request status changes and new scrutiny results.
+
+Signal handlers call publish(). On PostgreSQL the event goes out with
+pg_notify after commit. Every app process runs one LISTEN thread
+(start_listener, started from ems/asgi.py) that hands notifications to its
+in-process broker, which feeds the open SSE connections of that process.
+Without PostgreSQL the event is dispatched to the local broker directly.
+
+The stream view is async and meant to be served by the ASGI app; under
+WSGI each open stream would hold a worker thread.
+"""
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.http import HttpResponse, StreamingHttpResponse
+
+from .authentication import authenticate_request
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "ems_events"
+KEEPALIVE_SECONDS = 20
+QUEUE_SIZE = 256
+
+
+class EventBroker:
+    """Fan-out to asyncio queues owned by the event loops serving SSE clients."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+
+    def subscribe(self, loop):
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.add((loop, queue))
+        return queue
+
+    def unsubscribe(self, loop, queue):
+        with self._lock:
+            self._subscribers.discard((loop, queue))
+
+    def dispatch(self, event):
+        """Thread-safe; may be called from the listener thread or request threads."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(_offer, queue, event)
+            except RuntimeError:
+                # loop already closed; the stream's finally block will unsubscribe
+                pass
+
+
+def _offer(queue, event):
+    if queue.full():
+        # a slow client loses its oldest event rather than blocking everyone
+        queue.get_nowait()
+    queue.put_nowait(event)
+
+
+broker = EventBroker()
+
+
+def publish(event):
+    """Send event to every process once the current transaction commits."""
+    def _send():
+        if connection.vendor == "postgresql":
+            payload = json.dumps(event, cls=DjangoJSONEncoder)
+            with connection.cursor() as cur:
+                cur.execute("SELECT pg_notify(%s, %s)", [CHANNEL, payload])
+        else:
+            broker.dispatch(json.loads(json.dumps(event, cls=DjangoJSONEncoder)))
+
+    transaction.on_commit(_send)
+
+
+# ---- cross-process fan-out ----
+
+_listener = None
+_listener_lock = threading.Lock()
+
+
+def _listen_forever():
+    import psycopg2
+    import psycopg2.extensions
+
+    db = settings.DATABASES["default"]
+    while True:
+        conn = None
+        try:
+            conn = psycopg2.connect(
+                dbname=db.get("NAME"), user=db.get("USER"), password=db.get("PASSWORD"),
+                host=db.get("HOST"), port=db.get("PORT"),
+            )
+            conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            with conn.cursor() as cur:
+                cur.execute(f"LISTEN {CHANNEL}")
+            logger.info("events: listening on %s", CHANNEL)
+            while True:
+                if select.select([conn], [], [], KEEPALIVE_SECONDS) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    note = conn.notifies.pop(0)
+                    try:
+                        broker.dispatch(json.loads(note.payload))
+                    except ValueError:
+                        logger.warning("events: dropping malformed payload")
+        except Exception:
+            logger.exception("events: listener failed, reconnecting")
+            time.sleep(5)
+        finally:
+            if conn is not None:
+                conn.close()
+
+
+def start_listener():
+    """Start this process's LISTEN thread (idempotent, PostgreSQL only)."""
+    global _listener
+    if settings.DATABASES["default"]["ENGINE"] != "django.db.backends.postgresql":
+        return
+    with _listener_lock:
+        if _listener is None:
+            _listener = threading.Thread(target=_listen_forever, name="ems-events-listener", daemon=True)
+            _listener.start()
+
+
+# ---- SSE endpoint ----
+
+def _visible(user, event, s_code):
+    if s_code and event.get("s_code") != s_code:
+        return False
+    if user.role == "coe":
+        return True
+    if user.role == "teacher":
+        return event.get("teacher_id") == user.id
+    if user.role == "superintendent":
+        return event.get("type") == "request.status" and event.get("status") == "Finalized"
+    return False
+
+
+async def event_stream(request):
+    user = await sync_to_async(authenticate_request)(request, allow_query_token=True)
+    if user is None:
+        return HttpResponse(status=401)
+    s_code = request.GET.get("s_code")
+    loop = asyncio.get_running_loop()
+    queue = broker.subscribe(loop)
+
+    async def stream():
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if _visible(user, event, s_code):
+                    yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            broker.unsubscribe(loop, queue)
+
+    response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,192 @@
+"""
+Streaming CSV / XLSX exports of scrutiny results and requests.
+
+Rows come from values_list(...).iterator(chunk_size=EXPORT_CHUNK_SIZE),
+which on PostgreSQL reads through a server-side cursor, and are encoded and
+sent one chunk at a time, so memory stays flat however many rows match.
+XLSX is written with zipfile into a write-only sink that is drained after
+every chunk; the worksheet uses inline strings so no shared-string table
+has to be built up front.
+"""
+import csv
+import io
+import re
+import zipfile
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.utils.dateparse import parse_date
+
+from .models import Request
+
+try:
+    from scrutiny.models import ScrutinyResult
+except Exception:
+    ScrutinyResult = None
+
+FORMATS = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+# name: (model, date field used by ?since=/?until=, [(header, lookup), ...])
+DATASETS = {
+    "scrutiny": (ScrutinyResult, "created_at", [
+        ("result_id", "id"),
+        ("request_id", "request_obj_id"),
+        ("s_code", "s_code"),
+        ("teacher", "request_obj__tusername"),
+        ("overall_score", "overall_score"),
+        ("plagiarism_score", "plagiarism_score"),
+        ("quality_status", "quality_status"),
+        ("created_at", "created_at"),
+    ]),
+    "requests": (Request, "deadline", [
+        ("request_id", "id"),
+        ("s_code", "s_code"),
+        ("teacher", "tusername"),
+        ("status", "status"),
+        ("deadline", "deadline"),
+        ("total_marks", "total_marks"),
+    ]),
+}
+
+
+def export_rows(dataset, params, using=None):
+    """(headers, row iterator) for dataset filtered by ?s_code=, ?since=, ?until=; raises ValueError."""
+    if dataset not in DATASETS or DATASETS[dataset][0] is None:
+        raise ValueError(f"unknown dataset '{dataset}'")
+    model, date_field, columns = DATASETS[dataset]
+    qs = model.objects.using(using) if using else model.objects.all()
+    if params.get("s_code"):
+        qs = qs.filter(s_code=params["s_code"])
+    for param, lookup in (("since", "gte"), ("until", "lte")):
+        if params.get(param):
+            day = parse_date(params[param])
+            if day is None:
+                raise ValueError(f"{param} must be YYYY-MM-DD")
+            field = f"{date_field}__date" if date_field == "created_at" else date_field
+            qs = qs.filter(**{f"{field}__{lookup}": day})
+    rows = qs.order_by("id").values_list(*[lookup for _h, lookup in columns]).iterator(
+        chunk_size=settings.EXPORT_CHUNK_SIZE
+    )
+    return [h for h, _l in columns], rows
+
+
+def _batched(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _cell_text(value):
+    if value is None:
+        return ""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def iter_csv(headers, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(headers)
+    for batch in _batched(rows, settings.EXPORT_CHUNK_SIZE):
+        yield "".join(writer.writerow([_cell_text(v) for v in row]) for row in batch)
+
+
+# ---- XLSX ----
+
+_ILLEGAL_XML = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="xl/workbook.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+    '</Relationships>'
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets></workbook>'
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="worksheets/sheet1.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+    '</Relationships>'
+)
+_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_TAIL = "</sheetData></worksheet>"
+
+
+class _Sink(io.RawIOBase):
+    """Write-only, unseekable target for zipfile; drain() hands back what was written."""
+
+    def __init__(self):
+        self._parts = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def _xlsx_cell(value):
+    if isinstance(value, bool) or value is None or not isinstance(value, (int, float)):
+        text = _ILLEGAL_XML.sub("", escape(_cell_text(value)))
+        return f'<c t="inlineStr"><is><t>{text}</t></is></c>'
+    return f"<c><v>{value}</v></c>"
+
+
+def _xlsx_row(values):
+    return "<row>" + "".join(_xlsx_cell(v) for v in values) + "</row>"
+
+
+def iter_xlsx(headers, rows, sheet_name="Export"):
+    sink = _Sink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        zf.writestr("_rels/.rels", _ROOT_RELS)
+        zf.writestr("xl/workbook.xml", _WORKBOOK.format(name=escape(sheet_name)))
+        zf.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        with zf.open("xl/worksheets/sheet1.xml", "w") as sheet:
+            sheet.write((_SHEET_HEAD + _xlsx_row(headers)).encode())
+            for batch in _batched(rows, settings.EXPORT_CHUNK_SIZE):
+                sheet.write("".join(_xlsx_row(row) for row in batch).encode())
+                yield sink.drain()
+            sheet.write(_SHEET_TAIL.encode())
+    yield sink.drain()
@@ -1,3 +1,7 @@
+import asyncio
+import weakref
+
+import httpx
 import requests
 from django.conf import settings
 import os
@@ -41,3 +45,54 @@ def get_file(cid):
     res = requests.post(f"{api_url}/cat?arg={cid}")
     res.raise_for_status()
     return res.content
+
+
+# ---- async variants for the ASGI views (exams/views_async.py) ----
+
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def _async_client():
+    """One keep-alive httpx client per running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(timeout=httpx.Timeout(60.0, connect=10.0))
+        _async_clients[loop] = client
+    return client
+
+
+async def add_file_async(path, mfs_path=None):
+    """Async add_file(): same IPFS/MFS calls without blocking the event loop."""
+    api_url = get_ipfs_api_url()
+    client = _async_client()
+    with open(path, 'rb') as f:
+        res = await client.post(f"{api_url}/add", params={"pin": "true"}, files={'file': f})
+    res.raise_for_status()
+    data = res.json()
+    cid = data['Hash']
+
+    if mfs_path:
+        folder = os.path.dirname(mfs_path)
+        await client.post(f"{api_url}/files/mkdir", params={"arg": folder, "parents": "true"})
+        await client.post(f"{api_url}/files/rm", params={"arg": mfs_path, "force": "true"})
+        await client.post(f"{api_url}/files/cp", params=[("arg", f"/ipfs/{cid}"), ("arg", mfs_path)])
+
+    return data
+
+
+async def get_file_async(cid):
+    """Async get_file()."""
+    api_url = get_ipfs_api_url()
+    res = await _async_client().post(f"{api_url}/cat", params={"arg": cid})
+    res.raise_for_status()
+    return res.content
+
+
+async def stream_file_async(cid, chunk_size=64 * 1024):
+    """Yield the content of cid in chunks instead of buffering it whole."""
+    api_url = get_ipfs_api_url()
+    async with _async_client().stream("POST", f"{api_url}/cat", params={"arg": cid}) as res:
+        res.raise_for_status()
+        async for chunk in res.aiter_bytes(chunk_size):
+            yield chunk
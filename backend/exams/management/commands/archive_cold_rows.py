@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from exams.archive import archive_cold_rows, vacuum_hot_tables
+
+
+class Command(BaseCommand):
+    help = "Move finalized requests and their scrutiny results older than N semesters to the archive tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--semesters", type=int, default=settings.ARCHIVE_AFTER_SEMESTERS,
+                            help="keep this many past semesters hot (plus the current one)")
+        parser.add_argument("--batch-size", type=int, default=500, help="requests moved per transaction")
+        parser.add_argument("--dry-run", action="store_true", help="only count what would be moved")
+        parser.add_argument("--vacuum", action="store_true", help="VACUUM ANALYZE the hot tables afterwards")
+
+    def handle(self, *args, **opts):
+        report = archive_cold_rows(opts["semesters"], batch_size=opts["batch_size"], dry_run=opts["dry_run"])
+        verb = "would archive" if report["dry_run"] else "archived"
+        self.stdout.write(
+            f"{verb} {report['requests']} request(s) and {report['scrutiny_results']} scrutiny result(s) "
+            f"older than {report['cutoff']}"
+        )
+        if opts["vacuum"] and not report["dry_run"]:
+            tables = vacuum_hot_tables()
+            self.stdout.write(f"vacuumed {', '.join(tables)}")
@@ -0,0 +1,127 @@
+import asyncio
+import statistics
+import time
+
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from exams import views_api, views_async
+from exams.authentication import ProfileRefreshToken
+from exams.models import CustomUser, Request
+from scrutiny.models import ScrutinyResult, quality_status_for
+from scrutiny.scrutiny_utils import rebuild_dashboard_counters
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _seed_candidates(n, s_code="BENCH01"):
+    teachers = CustomUser.objects.bulk_create([
+        CustomUser(username=f"bench_t{i}", password="!", teacher_id=f"BEN-{i}", first_name="Bench", last_name=str(i))
+        for i in range(n)
+    ])
+    # two uploads per teacher so the latest-per-teacher dedupe has work to do
+    reqs = Request.objects.bulk_create(
+        [Request(tusername=t.username, teacher=t, s_code=s_code, status="Uploaded") for t in teachers for _ in range(2)]
+    )
+    ScrutinyResult.objects.bulk_create([
+        ScrutinyResult(
+            request_obj=r,
+            summary={"overall_score": 0.7, "plagiarism_analysis": {"plagiarism_score": 0.1}},
+            overall_score=0.7,
+            plagiarism_score=0.1,
+            quality_status="good",
+        )
+        for r in reqs
+    ])
+    coe = CustomUser.objects.create(username="bench_coe", password="!", teacher_id="BEN-COE", role="coe")
+    return coe, {"s_code": s_code}
+
+
+def _seed_dashboard(n, subjects=40):
+    teachers = CustomUser.objects.bulk_create([
+        CustomUser(username=f"bench_t{i}", password="!", teacher_id=f"BEN-{i}", first_name="Bench", last_name=str(i))
+        for i in range(n)
+    ])
+    statuses = ["Pending", "Accepted", "Uploaded", "Finalized"]
+    reqs = Request.objects.bulk_create([
+        Request(tusername=t.username, teacher=t, s_code=f"BD{(i + j) % subjects:03d}", status=statuses[(i + j) % 4])
+        for i, t in enumerate(teachers) for j in range(5)
+    ])
+    results = []
+    for i, r in enumerate(reqs):
+        if r.status not in ("Uploaded", "Finalized"):
+            continue
+        score = (i % 100) / 100
+        results.append(ScrutinyResult(
+            request_obj=r, s_code=r.s_code, summary={"overall_score": score},
+            overall_score=score, plagiarism_score=0.1, quality_status=quality_status_for(score),
+        ))
+    ScrutinyResult.objects.bulk_create(results)
+    # bulk_create skips the signals that keep the counters table current
+    rebuild_dashboard_counters()
+    coe = CustomUser.objects.create(username="bench_coe", password="!", teacher_id="BEN-COE", role="coe")
+    return coe, {}
+
+
+ENDPOINTS = {
+    # name: (seed function, view, path, default latency target in ms)
+    "candidates": (_seed_candidates, views_async.candidates, "/api/coe/candidates/", 10.0),
+    "dashboard": (_seed_dashboard, views_api.COEDashboard, "/api/coe/dashboard/", 50.0),
+}
+
+
+class Command(BaseCommand):
+    help = "Seed synthetic data in a rolled-back transaction and time an endpoint's query count and latency."
+
+    def add_arguments(self, parser):
+        parser.add_argument("endpoint", choices=sorted(ENDPOINTS))
+        parser.add_argument("--rows", type=int, default=200, help="size of the seeded dataset (e.g. candidates)")
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument("--target-ms", type=float, default=None,
+                            help="fail if the median exceeds this (default: the endpoint's own target)")
+        parser.add_argument("--max-queries", type=int, default=None, help="fail if a call runs more queries")
+
+    def handle(self, *args, **opts):
+        seed, view, path, target_ms = ENDPOINTS[opts["endpoint"]]
+        if opts["target_ms"] is not None:
+            target_ms = opts["target_ms"]
+        factory = RequestFactory()
+        if asyncio.iscoroutinefunction(view):
+            view = async_to_sync(view)
+        timings, query_counts = [], set()
+        status_code = None
+        try:
+            with transaction.atomic():
+                user, params = seed(opts["rows"])
+                # real bearer auth, so the user lookup is part of what is measured
+                auth = f"Bearer {ProfileRefreshToken.for_user(user).access_token}"
+                for _ in range(opts["iterations"]):
+                    request = factory.get(path, params, HTTP_AUTHORIZATION=auth)
+                    with CaptureQueriesContext(connection) as ctx:
+                        started = time.perf_counter()
+                        response = view(request)
+                        if hasattr(response, "render"):
+                            response.render()
+                        timings.append((time.perf_counter() - started) * 1000)
+                    query_counts.add(len(ctx.captured_queries))
+                    status_code = response.status_code
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+        timings.sort()
+        median = statistics.median(timings)
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        self.stdout.write(
+            f"{opts['endpoint']}: rows={opts['rows']} status={status_code} "
+            f"queries={sorted(query_counts)} median={median:.2f}ms p95={p95:.2f}ms"
+        )
+        if opts["max_queries"] is not None and max(query_counts) > opts["max_queries"]:
+            raise CommandError(f"{max(query_counts)} queries exceeds --max-queries={opts['max_queries']}")
+        if median > target_ms:
+            raise CommandError(f"median {median:.2f}ms exceeds target {target_ms}ms")
@@ -0,0 +1,50 @@
+from types import SimpleNamespace
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpResponse
+
+from ems.db_router import PIN_COOKIE, REPLICA_ALIAS, pin_to_primary, read_scope, replica_configured
+from exams.models import Request
+
+
+class Command(BaseCommand):
+    help = (
+        "Show where reads go with the replica router: role and lag of each database, "
+        "and the alias a @replica_reads view uses for a user before and after a write."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--username", help="user to route for (default: first user)")
+
+    def _describe(self, alias):
+        with connections[alias].cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_is_in_recovery(), "
+                "CASE WHEN pg_is_in_recovery() THEN now() - pg_last_xact_replay_timestamp() END"
+            )
+            standby, lag = cursor.fetchone()
+        role = "standby" if standby else "primary"
+        self.stdout.write(f"{alias}: {role}" + (f", replay lag {lag}" if standby else ""))
+
+    def handle(self, *args, **opts):
+        if not replica_configured():
+            raise CommandError("no replica configured: set DB_REPLICA_HOST (see ems/settings.py)")
+        self._describe(DEFAULT_DB_ALIAS)
+        self._describe(REPLICA_ALIAS)
+
+        users = get_user_model().objects.order_by("id")
+        user = users.filter(username=opts["username"]).first() if opts["username"] else users.first()
+        if user is None:
+            raise CommandError("no such user")
+        request = SimpleNamespace(user=user, COOKIES={})
+
+        with read_scope(request):
+            self.stdout.write(f"{user.username}: reads -> {Request.objects.all().db}")
+        # what ReplicaRoutingMiddleware does after a write: the next request carries the pin cookie
+        response = HttpResponse()
+        pin_to_primary(response, user.pk)
+        request.COOKIES[PIN_COOKIE] = response.cookies[PIN_COOKIE].value
+        with read_scope(request):
+            self.stdout.write(f"{user.username} after a write: reads -> {Request.objects.all().db}")
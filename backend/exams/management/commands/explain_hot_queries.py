@@ -0,0 +1,101 @@
+import random
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from exams.models import CustomUser, Request, ACTIVE_STATUSES
+from scrutiny.models import ScrutinyResult
+
+INDEX_NODE = re.compile(r"(Index Scan|Index Only Scan|Bitmap Index Scan)")
+SUBJECTS = ["Internet of Things", "Parallel Computing", "Cryptography", "Big Data Analytics", "MACHINE LEARNING"]
+SEMS = ["I", "II", "III", "IV", "V", "VI", "VII", "VIII"]
+BRANCHES = ["CSE", "IT", "ECE", "EEE", "MECH", "BioTech"]
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a synthetic dataset inside a transaction, EXPLAIN the dashboard hot "
+        "queries and fail if any of them is planned without an index. Nothing is kept."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100_000, help="Request and ScrutinyResult rows to seed")
+        parser.add_argument("--teachers", type=int, default=2_000)
+        parser.add_argument("--verbose-plans", action="store_true")
+
+    def handle(self, *args, **opts):
+        if connection.vendor != "postgresql":
+            raise CommandError("explain_hot_queries needs PostgreSQL")
+        failures = []
+        try:
+            with transaction.atomic():
+                probe = self._seed(opts["rows"], opts["teachers"])
+                with connection.cursor() as cur:
+                    cur.execute("ANALYZE")
+                for name, qs in self._hot_queries(probe):
+                    plan = qs.explain()
+                    ok = bool(INDEX_NODE.search(plan))
+                    self.stdout.write(f"{'OK  ' if ok else 'FAIL'} {name}")
+                    if opts["verbose_plans"] or not ok:
+                        self.stdout.write(plan)
+                    if not ok:
+                        failures.append(name)
+                raise _Rollback()
+        except _Rollback:
+            pass
+        if failures:
+            raise CommandError(f"{len(failures)} hot query(ies) not using an index: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("all hot queries use an index"))
+
+    def _seed(self, rows, n_teachers):
+        rnd = random.Random(42)
+        teachers = CustomUser.objects.bulk_create([
+            CustomUser(
+                username=f"explain_t{i}",
+                password="!",
+                teacher_id=f"EXP-{i}",
+                course="B.E.",
+                semester=rnd.choice(SEMS),
+                branch=rnd.choice(BRANCHES),
+                subject=rnd.choice(SUBJECTS),
+            )
+            for i in range(n_teachers)
+        ], batch_size=5_000)
+
+        s_codes = [f"EX{n:03d}" for n in range(400)]
+        reqs = []
+        for i in range(rows):
+            t = teachers[i % n_teachers]
+            # history is mostly finalized/rejected; only a few percent is active
+            status = rnd.choice(ACTIVE_STATUSES) if rnd.random() < 0.05 else rnd.choice(["Finalized", "Rejected"])
+            reqs.append(Request(tusername=t.username, teacher=t, s_code=rnd.choice(s_codes), status=status))
+        reqs = Request.objects.bulk_create(reqs, batch_size=5_000)
+        ScrutinyResult.objects.bulk_create(
+            [ScrutinyResult(request_obj=r, summary={}, overall_score=rnd.random()) for r in reqs],
+            batch_size=5_000,
+        )
+        return {"teacher": teachers[0], "s_code": s_codes[0], "request": reqs[-1]}
+
+    def _hot_queries(self, probe):
+        t = probe["teacher"]
+        return [
+            ("teacher pending requests",
+             Request.objects.filter(teacher=t, status="Pending").order_by("-id")),
+            ("teacher accepted requests",
+             Request.objects.filter(teacher=t).exclude(status="Pending").order_by("-id")),
+            ("uploaded candidates by s_code",
+             Request.objects.filter(s_code=probe["s_code"], status="Uploaded").order_by("id")),
+            ("active requests for s_code",
+             Request.objects.filter(s_code=probe["s_code"], status__in=ACTIVE_STATUSES).values("teacher_id")),
+            ("COE active request list",
+             Request.objects.filter(status__in=ACTIVE_STATUSES).order_by("-id")[:50]),
+            ("teacher search by profile",
+             CustomUser.objects.filter(course=t.course, semester=t.semester, branch=t.branch, subject=t.subject)),
+            ("latest scrutiny for request",
+             ScrutinyResult.objects.filter(request_obj=probe["request"]).order_by("-created_at")[:1]),
+        ]
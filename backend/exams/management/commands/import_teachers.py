@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from exams.teacher_import import import_teachers, read_csv
+
+
+class Command(BaseCommand):
+    help = "Bulk-create teacher accounts from a CSV (username,password[,email,first_name,...])."
+
+    def add_arguments(self, parser):
+        parser.add_argument("csv_path")
+        parser.add_argument("--workers", type=int, default=None, help="password hashing processes (default: CPU count; 1 hashes in this process)")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **opts):
+        with open(opts["csv_path"], newline="", encoding="utf-8-sig") as f:
+            rows = read_csv(f)
+        report = import_teachers(rows, workers=opts["workers"], batch_size=opts["batch_size"])
+        for row in report["rows"]:
+            if row["status"] == "error":
+                self.stderr.write(f"line {row['line']} ({row['username']}): {row['detail']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"created {report['created']} teacher(s), {report['errors']} error(s) in {report['seconds']}s "
+            f"({report['rows_per_second']} rows/s, hashing {report['hashing_seconds']}s)"
+        ))
@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from exams.chain_indexer import sync_paper_events, DEFAULT_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = "Index PaperRecorded events from the ExamPapers contract into PaperRecord."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="blocks per eth_getLogs call")
+        parser.add_argument("--confirmations", type=int, default=0, help="stay this many blocks behind the head")
+        parser.add_argument("--follow", action="store_true", help="keep polling for new blocks")
+        parser.add_argument("--interval", type=float, default=5.0, help="seconds between polls with --follow")
+
+    def handle(self, *args, **opts):
+        while True:
+            stored = sync_paper_events(batch_size=opts["batch_size"], confirmations=opts["confirmations"])
+            self.stdout.write(f"indexed {stored} PaperRecorded event(s)")
+            if not opts["follow"]:
+                break
+            time.sleep(opts["interval"])
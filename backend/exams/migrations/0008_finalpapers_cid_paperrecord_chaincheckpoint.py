@@ -0,0 +1,45 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0007_alter_customuser_subject'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='finalpapers',
+            name='cid',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.CreateModel(
+            name='ChainCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('last_block', models.BigIntegerField(default=-1)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PaperRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('s_code_hash', models.CharField(max_length=66)),
+                ('s_code', models.CharField(blank=True, default='', max_length=7)),
+                ('cid', models.CharField(max_length=100)),
+                ('uploader', models.CharField(max_length=42)),
+                ('contract_address', models.CharField(max_length=42)),
+                ('block_number', models.BigIntegerField()),
+                ('tx_hash', models.CharField(max_length=66)),
+                ('log_index', models.IntegerField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['s_code_hash', 'block_number'], name='paperrecord_hash_block_idx')],
+                'constraints': [models.UniqueConstraint(fields=('tx_hash', 'log_index'), name='paperrecord_tx_log_uniq')],
+            },
+        ),
+    ]
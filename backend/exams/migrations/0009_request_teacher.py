@@ -0,0 +1,30 @@
+# Generated by Django 5.2.5 on 2026-10-18 10:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_teacher(apps, schema_editor):
+    Request = apps.get_model('exams', 'Request')
+    CustomUser = apps.get_model('exams', 'CustomUser')
+    Request.objects.filter(teacher__isnull=True).update(
+        teacher=Subquery(CustomUser.objects.filter(username=OuterRef('tusername')).values('id')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0008_finalpapers_cid_paperrecord_chaincheckpoint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='request',
+            name='teacher',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='requests', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(backfill_teacher, migrations.RunPython.noop),
+    ]
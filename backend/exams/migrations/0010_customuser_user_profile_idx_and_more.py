@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0009_request_teacher'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['course', 'semester', 'branch', 'subject'], name='user_profile_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='request',
+            index=models.Index(fields=['teacher', 'status'], name='request_teacher_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='request',
+            index=models.Index(fields=['s_code', 'status'], name='request_scode_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='request',
+            index=models.Index(condition=models.Q(('status__in', ['Pending', 'Accepted', 'Uploaded'])), fields=['-id'], name='request_active_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='request',
+            index=models.Index(condition=models.Q(('status__in', ['Pending', 'Accepted', 'Uploaded'])), fields=['s_code'], name='request_active_scode_idx'),
+        ),
+    ]
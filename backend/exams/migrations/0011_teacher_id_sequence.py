@@ -0,0 +1,29 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0010_customuser_user_profile_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=[
+                "CREATE SEQUENCE IF NOT EXISTS exams_teacher_id_seq",
+                # continue after the highest TEA-<n> handed out by the old default
+                """
+                SELECT setval(
+                    'exams_teacher_id_seq',
+                    COALESCE((
+                        SELECT MAX(CAST(split_part(teacher_id, '-', 2) AS bigint))
+                        FROM exams_customuser
+                        WHERE teacher_id ~ '^TEA-[0-9]+$'
+                    ), 0) + 1,
+                    false
+                )
+                """,
+            ],
+            reverse_sql="DROP SEQUENCE IF EXISTS exams_teacher_id_seq",
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.5 on 2026-10-18 18:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0013_customuser_token_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedRequest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.IntegerField(unique=True)),
+                ('tusername', models.CharField(default='None', max_length=40)),
+                ('s_code', models.CharField(default='None', max_length=7)),
+                ('deadline', models.DateField()),
+                ('status', models.CharField(choices=[('Pending', 'Pending'), ('Accepted', 'Accepted'), ('Uploaded', 'Uploaded'), ('Finalized', 'Finalized'), ('Rejected', 'Rejected')], max_length=10)),
+                ('total_marks', models.IntegerField(default=100)),
+                ('payload_codec', models.CharField(max_length=8)),
+                ('payload', models.BinaryField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('teacher', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_requests', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['s_code', 'deadline'], name='archived_request_scode_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 19:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0014_archivedrequest'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customuser',
+            name='teacher_id',
+            field=models.CharField(blank=True, default='', max_length=20),
+        ),
+    ]
@@ -1,18 +1,21 @@
-from django.db import models
+from django.db import models, connection
 from django.contrib.auth.models import AbstractUser
 import datetime
+import uuid
 from django.contrib.postgres.fields import ArrayField
 
+# Created by migration 0011; nextval() is atomic, so concurrent sign-ups never share an ID
+TEACHER_ID_SEQUENCE = 'exams_teacher_id_seq'
+
+def allocate_teacher_ids(count):
+    """Reserve `count` teacher IDs from the sequence in one round trip."""
+    with connection.cursor() as cur:
+        cur.execute("SELECT nextval(%s) FROM generate_series(1, %s)", [TEACHER_ID_SEQUENCE, count])
+        return ['TEA-' + str(row[0]) for row in cur.fetchall()]
+
 def teacherID():
-    t_id = 'TEA-1'
-    try:
-        prev = CustomUser.objects.values('teacher_id').last()
-        prev = prev['teacher_id']
-        number = int(prev.split('-')[1]) + 1
-        t_id = 'TEA-' + str(number)
-    except:
-        t_id = 'TEA-1'
-    return t_id
+    # referenced by migration 0001; new users get their ID in CustomUser.save()
+    return allocate_teacher_ids(1)[0]
 
 ROLE = (
     ('teacher', 'teacher'),
@@ -59,21 +62,73 @@ STATUS = (
     ('Rejected', 'Rejected'),
 )
 
+ACTIVE_STATUSES = ['Pending', 'Accepted', 'Uploaded']
+
 
 class CustomUser(AbstractUser):
-    teacher_id = models.CharField(max_length=20, default=teacherID, blank=True)
+    teacher_id = models.CharField(max_length=20, default='', blank=True)
     course = models.CharField(max_length=4, choices=(('None', 'None'), ('B.E.', "B.E."), ('M.E.', 'M.E.')), default='None')
     semester = models.CharField(max_length=4, choices=SEM, default='None')
     branch = models.CharField(max_length=40, choices=BRANCH, default='None')
     subject = models.CharField(max_length=30, choices=SUB, default='None')
     role = models.CharField(max_length=20, choices=ROLE, default='teacher')
+    # bumped when any VERSIONED_FIELDS value changes; JWTs carry it (exams/authentication.py)
+    token_version = models.PositiveIntegerField(default=0)
+
+    CLAIM_FIELDS = ('role', 'course', 'semester', 'branch', 'subject', 'teacher_id')
+    # is_active is not a claim, but deactivating must still invalidate issued tokens
+    VERSIONED_FIELDS = CLAIM_FIELDS + ('is_active',)
+    # shown next to the teacher's requests in polled lists (exams.signals logs their changes)
+    DISPLAY_FIELDS = ('username', 'first_name', 'last_name')
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['course', 'semester', 'branch', 'subject'], name='user_profile_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_claims = instance._claims()
+        instance._loaded_display = instance._display()
+        return instance
+
+    def _display(self):
+        return tuple(self.__dict__.get(name) for name in self.DISPLAY_FIELDS)
+
+    def _claims(self):
+        return tuple(self.__dict__.get(name) for name in self.VERSIONED_FIELDS)
+
+    def save(self, *args, **kwargs):
+        if self._state.adding and not self.teacher_id:
+            # allocated on insert only, so unsaved instances (system checks, forms) never touch the sequence
+            self.teacher_id = allocate_teacher_ids(1)[0]
+        loaded = getattr(self, '_loaded_claims', None)
+        if loaded is not None and loaded != self._claims():
+            self.token_version += 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'token_version'}
+        super().save(*args, **kwargs)
+        self._loaded_claims = self._claims()
 
     def __str__(self):
         return self.username
 
 
+class RequestQuerySet(models.QuerySet):
+    def with_teacher_profile(self):
+        """Annotate the teacher's course/semester/branch/subject via the same JOIN."""
+        return self.annotate(
+            teacher_course=models.F('teacher__course'),
+            teacher_semester=models.F('teacher__semester'),
+            teacher_branch=models.F('teacher__branch'),
+            teacher_subject=models.F('teacher__subject'),
+        )
+
+
 class Request(models.Model):
     tusername = models.CharField(max_length=40, default='None')
+    teacher = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, null=True, blank=True, related_name='requests')
     s_code = models.CharField(max_length=7, default="None")
     syllabus = models.FileField(upload_to='syllabus/', null=True, blank=True)
     q_pattern = models.FileField(upload_to='q_patterns/', null=True, blank=True)
@@ -83,6 +138,25 @@ class Request(models.Model):
     private_key = models.FileField(upload_to='private_keys/', null=True, blank=True)
     total_marks = models.IntegerField(default=100)
 
+    objects = RequestQuerySet.as_manager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # remembered so exams.signals can tell a status transition from other saves
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['teacher', 'status'], name='request_teacher_status_idx'),
+            models.Index(fields=['s_code', 'status'], name='request_scode_status_idx'),
+            models.Index(fields=['-id'], name='request_active_id_idx',
+                         condition=models.Q(status__in=ACTIVE_STATUSES)),
+            models.Index(fields=['s_code'], name='request_active_scode_idx',
+                         condition=models.Q(status__in=ACTIVE_STATUSES)),
+        ]
+
     def __str__(self):
         return f"{self.tusername} - {self.s_code}"
 
@@ -94,6 +168,7 @@ class FinalPapers(models.Model):
     branch = models.CharField(max_length=40, default='None')
     subject = models.CharField(max_length=30, default='None')
     paper = models.FileField(upload_to='final_papers/', null=True, blank=True)
+    cid = models.CharField(max_length=100, default='', blank=True)
 
     def __str__(self):
         return self.s_code
@@ -107,3 +182,108 @@ class SubjectCode(models.Model):
 
     def __str__(self):
         return self.subject
+
+
+class PaperRecord(models.Model):
+    """
+    Local copy of a PaperRecorded event. s_code is an indexed string in the
+    event, so the log only carries its keccak hash; s_code is filled in when
+    the hash matches a code we know about.
+    """
+    s_code_hash = models.CharField(max_length=66)
+    s_code = models.CharField(max_length=7, default='', blank=True)
+    cid = models.CharField(max_length=100)
+    uploader = models.CharField(max_length=42)
+    contract_address = models.CharField(max_length=42)
+    block_number = models.BigIntegerField()
+    tx_hash = models.CharField(max_length=66)
+    log_index = models.IntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['tx_hash', 'log_index'], name='paperrecord_tx_log_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['s_code_hash', 'block_number'], name='paperrecord_hash_block_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.s_code or self.s_code_hash} - {self.cid}"
+
+
+class ChainCheckpoint(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+    last_block = models.BigIntegerField(default=-1)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.last_block}"
+
+
+class ChangeLogEntry(models.Model):
+    """
+    Append-only change feed for the polled dashboard lists. The auto id is
+    the monotonic cursor clients pass back as ?since=.
+    """
+    model = models.CharField(max_length=40)
+    object_id = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['model', 'id'], name='changelog_model_id_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.id}: {self.model}#{self.object_id}{' (deleted)' if self.deleted else ''}"
+
+
+class ArchivedRequest(models.Model):
+    """
+    Cold copy of a finalized Request moved out of the hot table by
+    `manage.py archive_cold_rows` (exams/archive.py). File names and
+    enc_field are only needed while a request is in flight, so they are
+    kept in the compressed `payload` (exams/compression.py).
+    """
+    original_id = models.IntegerField(unique=True)
+    tusername = models.CharField(max_length=40, default='None')
+    teacher = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, null=True, blank=True,
+                                related_name='archived_requests')
+    s_code = models.CharField(max_length=7, default="None")
+    deadline = models.DateField()
+    status = models.CharField(max_length=10, choices=STATUS)
+    total_marks = models.IntegerField(default=100)
+    payload_codec = models.CharField(max_length=8)
+    payload = models.BinaryField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['s_code', 'deadline'], name='archived_request_scode_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.tusername} - {self.s_code} (archived)"
+
+
+class TeacherImportJob(models.Model):
+    """
+    A background teacher CSV import started from coe/teachers/import/
+    (exams/teacher_import.py). Kept in the database so any worker can answer
+    a status poll and the per-row report survives restarts.
+    """
+    JOB_STATUS = (
+        ('running', 'running'),
+        ('done', 'done'),
+        ('failed', 'failed'),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    status = models.CharField(max_length=10, choices=JOB_STATUS, default='running')
+    report = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"teacher import {self.id} ({self.status})"
@@ -0,0 +1,101 @@
+import binascii
+from base64 import b64decode, b64encode
+from collections import namedtuple
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+_Position = namedtuple("_Position", ["created_at", "id", "reverse"])
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Opaque-cursor pagination. Pages are fetched with WHERE id < <last id>
+    instead of OFFSET, so deep pages cost the same as the first one.
+    Clients pass ?cursor= from the previous response's next/previous links
+    and may override the page size with ?page_size=.
+    """
+    ordering = "-id"
+    page_size_query_param = "page_size"
+
+    def __init__(self):
+        self.page_size = getattr(settings, "API_PAGE_SIZE", 50)
+        self.max_page_size = getattr(settings, "API_MAX_PAGE_SIZE", 500)
+
+
+class CreatedAtKeysetPagination(KeysetPagination):
+    """
+    Keyset pagination on (created_at, id), newest first. CursorPagination
+    only keys on the first ordering field and falls back to an offset for
+    ties, so this compares the full pair instead:
+    WHERE created_at <= c AND (created_at < c OR id < i), which the
+    (-created_at) indexes serve as a range scan however many rows share a
+    timestamp. The cursor holds the boundary row's (created_at, id).
+    """
+    ordering = ("-created_at", "-id")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        self.request = request
+
+        position = self.decode_cursor(request)
+        if position is None:
+            rows = list(queryset.order_by("-created_at", "-id")[:self.page_size + 1])
+            self.has_previous, self.has_next = False, len(rows) > self.page_size
+            self.page = rows[:self.page_size]
+        elif not position.reverse:
+            created_at, pk = position.created_at, position.id
+            rows = list(
+                queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk),
+                                created_at__lte=created_at)
+                .order_by("-created_at", "-id")[:self.page_size + 1]
+            )
+            self.has_previous, self.has_next = True, len(rows) > self.page_size
+            self.page = rows[:self.page_size]
+        else:
+            created_at, pk = position.created_at, position.id
+            rows = list(
+                queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk),
+                                created_at__gte=created_at)
+                .order_by("created_at", "id")[:self.page_size + 1]
+            )
+            self.has_previous, self.has_next = len(rows) > self.page_size, True
+            self.page = list(reversed(rows[:self.page_size]))
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        last = self.page[-1]
+        return self.encode_cursor(_Position(last.created_at, last.pk, False))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        first = self.page[0]
+        return self.encode_cursor(_Position(first.created_at, first.pk, True))
+
+    def encode_cursor(self, position):
+        raw = f"{position.created_at.isoformat()}|{position.id}|{int(position.reverse)}"
+        encoded = b64encode(raw.encode("ascii")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            created_at, pk, reverse = b64decode(encoded.encode("ascii")).decode("ascii").split("|")
+            position = _Position(parse_datetime(created_at), int(pk), reverse == "1")
+        except (TypeError, ValueError, UnicodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if position.created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+        return position
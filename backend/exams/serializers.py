@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from .downloads import signed_download_url
 from .models import Request, FinalPapers, SubjectCode
 
 User = get_user_model()
@@ -90,11 +91,13 @@ class RequestSerializer(serializers.ModelSerializer):
         return None
 
     def _teacher_field(self, obj, field):
-        try:
-            user = User.objects.get(username=obj.tusername)
-            return getattr(user, field, None)
-        except User.DoesNotExist:
+        # list views use Request.objects.with_teacher_profile(), which annotates these
+        annotated = f"teacher_{field}"
+        if hasattr(obj, annotated):
+            return getattr(obj, annotated)
+        if obj.teacher_id is None:
             return None
+        return getattr(obj.teacher, field, None)
 
     def get_course(self, obj):
         return self._teacher_field(obj, "course")
@@ -109,6 +112,15 @@ class RequestSerializer(serializers.ModelSerializer):
         return self._teacher_field(obj, "subject")
 
 class FinalPaperSerializer(serializers.ModelSerializer):
+    # short-lived signed URL (exams/downloads.py), never the raw media path
+    paper = serializers.SerializerMethodField()
+
     class Meta:
         model = FinalPapers
         fields = ["id", "s_code", "course", "semester", "branch", "subject", "paper"]
+
+    def get_paper(self, obj):
+        request = self.context.get("request")
+        if not obj.paper or request is None:
+            return None
+        return signed_download_url(request, obj)
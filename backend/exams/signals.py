@@ -0,0 +1,80 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from . import cache as ref_cache
+from .authentication import remember_token_version, forget_token_version
+from .delta import record_change
+from .events import publish
+from .models import ACTIVE_STATUSES, CustomUser, SubjectCode, Request, FinalPapers
+
+
+@receiver([post_save, post_delete], sender=SubjectCode)
+def invalidate_subject_codes(sender, **kwargs):
+    ref_cache.invalidate(ref_cache.SUBJECT_CODES)
+
+
+@receiver([post_save, post_delete], sender=CustomUser)
+def invalidate_teachers(sender, **kwargs):
+    # login() saves last_login on every sign-in; that does not change search results
+    update_fields = kwargs.get("update_fields")
+    if update_fields and set(update_fields) <= {"last_login"}:
+        return
+    ref_cache.invalidate(ref_cache.TEACHERS)
+
+
+@receiver(post_save, sender=CustomUser)
+def cache_token_version(sender, instance, **kwargs):
+    pk, version = instance.pk, instance.token_version
+    if not instance.is_active:
+        transaction.on_commit(lambda: forget_token_version(pk))
+        return
+    transaction.on_commit(lambda: remember_token_version(pk, version))
+
+
+@receiver(post_delete, sender=CustomUser)
+def drop_token_version(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: forget_token_version(pk))
+
+
+@receiver(post_save, sender=Request)
+@receiver(post_save, sender=FinalPapers)
+def log_change(sender, instance, **kwargs):
+    record_change(sender._meta.label_lower, [instance.pk])
+
+
+@receiver(post_save, sender=CustomUser)
+def log_teacher_rename(sender, instance, created, **kwargs):
+    # COE request lists show the teacher's name, so a rename changes those rows
+    loaded = getattr(instance, '_loaded_display', None)
+    instance._loaded_display = instance._display()
+    if created or loaded is None or loaded == instance._loaded_display:
+        return
+    ids = Request.objects.filter(teacher_id=instance.pk, status__in=ACTIVE_STATUSES).values_list('id', flat=True)
+    record_change(Request._meta.label_lower, list(ids))
+
+
+@receiver(post_delete, sender=Request)
+@receiver(post_delete, sender=FinalPapers)
+def log_delete(sender, instance, **kwargs):
+    record_change(sender._meta.label_lower, [instance.pk], deleted=True)
+
+
+def request_status_event(req, previous_status=None):
+    return {
+        "type": "request.status",
+        "id": req.pk,
+        "s_code": req.s_code,
+        "status": req.status,
+        "previous_status": previous_status,
+        "teacher_id": req.teacher_id,
+    }
+
+
+@receiver(post_save, sender=Request)
+def publish_status_change(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_loaded_status", None)
+    if created or previous != instance.status:
+        publish(request_status_event(instance, None if created else previous))
+    instance._loaded_status = instance.status
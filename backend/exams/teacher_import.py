@@ -0,0 +1,183 @@
+import csv
+import logging
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, close_old_connections, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Models are imported inside import_teachers(): pool workers import this module
+# to unpickle _hash_password and must not need the app registry.
+
+# Imports started from the API run here, one at a time, outside the request
+IMPORT_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="teacher-import")
+
+COURSES = ("None", "B.E.", "M.E.")
+PROFILE_FIELDS = ("email", "first_name", "last_name", "course", "semester", "branch", "subject")
+
+
+def _hash_password(raw):
+    return make_password(raw)
+
+
+def read_csv(fileobj):
+    """Rows from a CSV with at least `username` and `password` columns."""
+    return list(csv.DictReader(fileobj))
+
+
+def _validate(rows, existing):
+    from .models import SEM, BRANCH, SUB
+
+    semesters = {s for s, _ in SEM}
+    branches = {b for b, _ in BRANCH}
+    subjects = {s for s, _ in SUB}
+    seen = set()
+    valid, outcomes = [], []
+    for line, row in enumerate(rows, start=2):  # line 1 is the header
+        username = (row.get("username") or "").strip()
+        password = row.get("password") or ""
+        error = None
+        if not username or not password:
+            error = "username and password are required"
+        elif username in seen:
+            error = "duplicate username in file"
+        elif username in existing:
+            error = "username already exists"
+        elif (row.get("course") or "None") not in COURSES:
+            error = "unknown course"
+        elif (row.get("semester") or "None") not in semesters:
+            error = "unknown semester"
+        elif (row.get("branch") or "None") not in branches:
+            error = "unknown branch"
+        elif (row.get("subject") or "None").strip() not in subjects:
+            error = "unknown subject"
+        seen.add(username)
+        if error:
+            outcomes.append({"line": line, "username": username, "status": "error", "detail": error})
+        else:
+            valid.append((line, username, password, row))
+    return valid, outcomes
+
+
+def _hash_all(passwords, workers):
+    if workers == 1 or len(passwords) < 2:
+        return [_hash_password(p) for p in passwords]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunksize = max(1, len(passwords) // ((workers or 4) * 4))
+        return list(pool.map(_hash_password, passwords, chunksize=chunksize))
+
+
+def _create(User, users, batch_size):
+    """bulk_create users; if a username was taken meanwhile, retry row by row. Returns the conflicting usernames."""
+    try:
+        with transaction.atomic():
+            User.objects.bulk_create(users, batch_size=batch_size)
+        return set()
+    except IntegrityError:
+        pass
+    conflicts = set()
+    for user in users:
+        try:
+            with transaction.atomic():
+                user.save(force_insert=True)
+        except IntegrityError:
+            conflicts.add(user.username)
+    return conflicts
+
+
+def import_teachers(rows, workers=1, batch_size=1000):
+    """
+    Create teacher accounts from parsed CSV rows. Existing usernames are found
+    with one query, passwords are hashed (in a process pool when workers != 1,
+    which only the management command asks for) and users are written with
+    bulk_create using IDs reserved from the teacher ID sequence. A username
+    created concurrently by another import is reported as a per-row conflict.
+    """
+    from django.contrib.auth import get_user_model
+    from . import cache as ref_cache
+    from .models import allocate_teacher_ids
+
+    User = get_user_model()
+    started = time.perf_counter()
+
+    usernames = [(r.get("username") or "").strip() for r in rows]
+    existing = set(User.objects.filter(username__in=usernames).values_list("username", flat=True))
+    valid, outcomes = _validate(rows, existing)
+
+    hashed = _hash_all([v[2] for v in valid], workers) if valid else []
+    hashed_at = time.perf_counter()
+
+    created = 0
+    if valid:
+        teacher_ids = allocate_teacher_ids(len(valid))
+        users = []
+        for (_line, username, _pwd, row), pwd_hash, t_id in zip(valid, hashed, teacher_ids):
+            profile = {f: (row.get(f) or "").strip() for f in PROFILE_FIELDS if row.get(f)}
+            users.append(User(username=username, password=pwd_hash, teacher_id=t_id, role="teacher", **profile))
+        conflicts = _create(User, users, batch_size)
+        for (line, username, _pwd, _row), user in zip(valid, users):
+            if username in conflicts:
+                outcomes.append({"line": line, "username": username, "status": "error",
+                                 "detail": "username already exists"})
+            else:
+                outcomes.append({"line": line, "username": username, "status": "created",
+                                 "teacher_id": user.teacher_id})
+                created += 1
+        # bulk_create sends no post_save, so drop cached teacher searches here
+        ref_cache.invalidate(ref_cache.TEACHERS)
+
+    elapsed = time.perf_counter() - started
+    report = {
+        "created": created,
+        "errors": sum(1 for o in outcomes if o["status"] == "error"),
+        "seconds": round(elapsed, 3),
+        "hashing_seconds": round(hashed_at - started, 3),
+        "rows_per_second": round(created / elapsed, 1) if elapsed else 0.0,
+        "rows": sorted(outcomes, key=lambda o: o["line"]),
+    }
+    logger.info("import_teachers: created=%s errors=%s in %.2fs (%.1f rows/s)",
+                report["created"], report["errors"], elapsed, report["rows_per_second"])
+    return report
+
+
+def _finish(job_id, status, report=None):
+    from .models import TeacherImportJob
+    TeacherImportJob.objects.filter(pk=job_id).update(status=status, report=report, finished_at=timezone.now())
+
+
+def _run_job(job_id, rows):
+    # executor threads are outside the request cycle, so manage their DB connection here
+    close_old_connections()
+    try:
+        _finish(job_id, "done", import_teachers(rows))
+    except Exception:
+        logger.exception("teacher import %s failed", job_id)
+        _finish(job_id, "failed")
+    finally:
+        close_old_connections()
+
+
+def submit_import(rows):
+    """Queue an import on IMPORT_EXECUTOR; returns a job id for import_status()."""
+    from .models import TeacherImportJob
+    job = TeacherImportJob.objects.create()
+    # start only once the job row is visible to the executor thread's connection
+    transaction.on_commit(lambda: IMPORT_EXECUTOR.submit(_run_job, job.pk, rows))
+    return job.pk.hex
+
+
+def import_status(job_id):
+    """{"status": ..., "report": ...} for a job id from submit_import(), or None."""
+    from .models import TeacherImportJob
+    try:
+        job_id = uuid.UUID(str(job_id))
+    except ValueError:
+        return None
+    job = TeacherImportJob.objects.filter(pk=job_id).values("status", "report").first()
+    if job is None:
+        return None
+    return job if job["report"] is not None else {"status": job["status"]}
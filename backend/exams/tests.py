@@ -1,3 +1,89 @@
+import datetime
+
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from .authentication import ProfileRefreshToken, remember_token_version
+from .models import CustomUser, Request
+
+
+class TeacherRequestListQueryCountTests(TestCase):
+    """
+    The teacher request lists read the teacher profile fields from
+    annotations on the list query (Request.objects.with_teacher_profile()),
+    so a page costs one query however many requests it holds.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.teacher = CustomUser.objects.create_user(
+            username="teacher1", password="x", role="teacher",
+            course="B.E.", semester="VII", branch="CSE", subject="Cryptography",
+        )
+        # the post_save hook caches this on commit, which TestCase never reaches
+        remember_token_version(self.teacher.pk, self.teacher.token_version)
+        token = ProfileRefreshToken.for_user(self.teacher).access_token
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def _add_requests(self, count, status):
+        Request.objects.bulk_create([
+            Request(
+                tusername=self.teacher.username, teacher=self.teacher, s_code=f"CS{i:03d}",
+                deadline=datetime.date(2026, 12, 1), status=status,
+            )
+            for i in range(count)
+        ])
+
+    def _assert_one_query(self, url, expected_rows):
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        rows = response.data["results"] if isinstance(response.data, dict) else response.data
+        self.assertEqual(len(rows), expected_rows)
+        self.assertEqual(
+            {(r["course"], r["semester"], r["branch"], r["subject"]) for r in rows},
+            {("B.E.", "VII", "CSE", "Cryptography")},
+        )
+
+    def test_pending_list_is_one_query(self):
+        self._add_requests(3, "Pending")
+        self._assert_one_query("/api/teacher/requests/pending/", 3)
+        self._add_requests(30, "Pending")
+        self._assert_one_query("/api/teacher/requests/pending/", 33)
+
+    def test_accepted_list_is_one_query(self):
+        self._add_requests(3, "Accepted")
+        self._assert_one_query("/api/teacher/requests/accepted/", 3)
+        self._add_requests(30, "Accepted")
+        self._assert_one_query("/api/teacher/requests/accepted/", 33)
+
+
+class DeactivatedUserClaimsAuthTests(TestCase):
+    """Claims-auth views never load the user row, so deactivation must reach them through token_version."""
+
+    url = "/api/teacher/requests/pending/"
+
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.teacher = CustomUser.objects.create_user(username="teacher2", password="x", role="teacher")
+        token = ProfileRefreshToken.for_user(self.teacher).access_token
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_active_user_is_let_in(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_deactivated_user_gets_401(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.teacher.is_active = False
+            self.teacher.save()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
 
-# Create your tests here.
+    def test_deactivated_user_gets_401_on_cache_miss(self):
+        CustomUser.objects.filter(pk=self.teacher.pk).update(is_active=False)
+        cache.clear()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
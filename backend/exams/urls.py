@@ -1,6 +1,9 @@
 
 from django.urls import path
 from . import views_api as v
+from . import downloads
+from . import events
+from . import views_async as av
 
 urlpatterns = [
     
@@ -15,16 +18,28 @@ urlpatterns = [
     path("teacher/requests/accepted/", v.TeacherAcceptedRequests.as_view()),
     path("teacher/requests/<int:req_id>/accept/", v.TeacherAcceptRequest),
     path("teacher/requests/<int:req_id>/reject/", v.TeacherRejectRequest),
-    path("teacher/requests/<int:req_id>/upload/", v.TeacherUploadPaper.as_view()),
+    path("teacher/requests/<int:req_id>/upload/", av.upload_paper),
     path("teacher/final-papers/", v.TeacherMyFinalPapers.as_view()),
 
   
+    path("coe/dashboard/", v.COEDashboard),                      # requests, subject counts, scores, summary in one call
     path("coe/requests/", v.COEListRequests.as_view()),           # list active requests for COE dashboard
     path("coe/teachers/", v.COEGetTeachers),                     # search teachers (returns default files if configured)
     path("coe/requests/add/", v.COEAddTeacher),                  # create request (uses subject defaults if files not sent)
-    path("coe/candidates/", v.COECandidates),                    # GET ?s_code=...
-    path("coe/requests/<int:req_id>/finalize/", v.COEFinalize),  # finalize chosen candidate
+    path("coe/requests/bulk/", v.COEBulkAssign),                 # many requests at once, per-row outcomes
+    path("coe/teachers/import/", v.COEImportTeachers),           # bulk teacher CSV import (202 + job)
+    path("coe/teachers/import/<str:job_id>/", v.COEImportTeachersStatus),  # import job status/report
+    path("coe/export/<str:dataset>/", v.COEExport),              # scrutiny|requests, ?output=csv|xlsx&s_code=&since=&until=
+    path("coe/cache-stats/", v.CacheStats),                      # reference cache hit ratios
+    path("coe/candidates/", av.candidates),                      # GET ?s_code=...
+    path("coe/requests/<int:req_id>/finalize/", av.finalize),    # finalize chosen candidate
 
     path("sup/final-papers/", v.SuperintendentListFinal.as_view()),
-    path("sup/final-papers/<int:paper_id>/decrypt-info/", v.SuperintendentGetDecryptInfo),
+    path("sup/final-papers/bundle/", v.SuperintendentBundle),       # ZIP of ?course=&semester=&branch= (Range resumable)
+    path("sup/final-papers/<int:paper_id>/decrypt-info/", av.decrypt_info),
+    path("sup/final-papers/<int:paper_id>/download/", downloads.download_final_paper,
+         name="final-paper-download"),                           # signed ?token= from decrypt-info
+    path("sup/verify-papers/", v.VerifyPaperHistory),             # POST {"s_codes": [...]}
+
+    path("events/", events.event_stream),                        # SSE status stream (ASGI), ?token=&s_code=
 ]
@@ -1,39 +1,52 @@
 # backend/exams/views_api.py
-import os
-import tempfile
+import io
 import logging
 
-from django.core.files import File
-from django.conf import settings
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, authentication_classes, permission_classes, parser_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework import status, generics
+from rest_framework import generics
 from rest_framework.parsers import MultiPartParser, FormParser
-from rest_framework_simplejwt.tokens import RefreshToken
 
 from django.contrib.auth import authenticate, get_user_model
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.db.models import Count, F, OuterRef, Q, Subquery
 
 from .serializers import *
 from .models import *
-from .encryption import encrypt_file, decrypt_file
-from .a_encryption import a_encryption, a_decryption
-from .ipfs_utils import add_file, get_file
-from .blockchain import record_cid
+from .chain_indexer import verify_s_codes
+from .pagination import KeysetPagination
+from .teacher_import import import_status, read_csv, submit_import
+from .assignments import assign_requests, MAX_ASSIGNMENTS
+from .exports import FORMATS, export_rows, iter_csv, iter_xlsx
+from . import cache as ref_cache
+from .delta import sync_response
+from .authentication import ProfileRefreshToken, ClaimsJWTAuthentication
+from .bundles import bundle_response, BundleTooLarge, _safe
+from .downloads import url_epoch
+from ems.db_router import current_read_alias, replica_reads
 
-# Import scrutiny analyzer (comprehensive)
 try:
-    from scrutiny.scrutiny_utils import perform_automatic_scrutiny
     from scrutiny.models import ScrutinyResult
+    from scrutiny.fieldsets import summary_projection
 except Exception:
-    perform_automatic_scrutiny = None
     ScrutinyResult = None
 
+try:
+    from scrutiny.scrutiny_utils import get_scrutiny_summary_for_dashboard
+except Exception:
+    get_scrutiny_summary_for_dashboard = None
+
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
+# Hot read endpoints authenticate from the token claims alone (no user row load)
+CLAIMS_AUTH = [ClaimsJWTAuthentication]
+
+
 def _tokens_for_user(user):
-    refresh = RefreshToken.for_user(user)
+    refresh = ProfileRefreshToken.for_user(user)
     return {"refresh": str(refresh), "access": str(refresh.access_token)}
 
 # -------- AUTH ----------
@@ -59,29 +72,38 @@ def login_user(request):
 
 # ------- COMMON ---------
 class SubjectCodeList(generics.ListAPIView):
+    authentication_classes = CLAIMS_AUTH
     permission_classes = [IsAuthenticated]
     queryset = SubjectCode.objects.all()
     serializer_class = SubjectCodeSerializer
 
+    def list(self, request, *args, **kwargs):
+        return Response(ref_cache.subject_code_list())
+
 # ------- TEACHER --------
+@replica_reads
 class TeacherPendingRequests(generics.ListAPIView):
+    authentication_classes = CLAIMS_AUTH
     permission_classes = [IsAuthenticated]
     serializer_class = RequestSerializer
 
     def get_queryset(self):
-        return Request.objects.filter(tusername=self.request.user.username, status="Pending").order_by("-id")
+        return Request.objects.filter(teacher_id=self.request.user.id, status="Pending").with_teacher_profile().order_by("-id")
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context.update({"request": self.request})
         return context
 
+@replica_reads
 class TeacherAcceptedRequests(generics.ListAPIView):
+    authentication_classes = CLAIMS_AUTH
     permission_classes = [IsAuthenticated]
     serializer_class = RequestSerializer
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
-        return Request.objects.filter(tusername=self.request.user.username).exclude(status="Pending").order_by("-id")
+        return Request.objects.filter(teacher_id=self.request.user.id).exclude(status="Pending").with_teacher_profile().order_by("-id")
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -91,7 +113,7 @@ class TeacherAcceptedRequests(generics.ListAPIView):
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def TeacherAcceptRequest(request, req_id):
-    r = Request.objects.filter(id=req_id, tusername=request.user.username).first()
+    r = Request.objects.filter(id=req_id, teacher=request.user).first()
     if not r:
         return Response({"detail": "Not found"}, status=404)
     r.status = "Accepted"
@@ -101,7 +123,7 @@ def TeacherAcceptRequest(request, req_id):
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def TeacherRejectRequest(request, req_id):
-    r = Request.objects.filter(id=req_id, tusername=request.user.username).first()
+    r = Request.objects.filter(id=req_id, teacher=request.user).first()
     if not r:
         return Response({"detail": "Not found"}, status=404)
     r.status = "Rejected"
@@ -109,155 +131,12 @@ def TeacherRejectRequest(request, req_id):
     return Response({"message": "Rejected"})
 
 
-class TeacherUploadPaper(generics.GenericAPIView):
-    permission_classes = [IsAuthenticated]
-    parser_classes = [MultiPartParser, FormParser]
-
-    def post(self, request, req_id):
-        logger.debug("TeacherUploadPaper called by user=%s req_id=%s", request.user.username, req_id)
-        r = Request.objects.filter(id=req_id, tusername=request.user.username).first()
-        if not r:
-            logger.warning("TeacherUploadPaper: request not found: %s", req_id)
-            return Response({"detail": "Request not found"}, status=404)
-        if r.status not in ("Accepted",):
-            logger.info("TeacherUploadPaper: request status not allowed: %s", r.status)
-            return Response({"detail": "Upload allowed only for Accepted requests"}, status=400)
-
-        paper = request.FILES.get("paper")
-        if not paper:
-            logger.info("TeacherUploadPaper: missing file in request")
-            return Response({"detail": "paper is required"}, status=400)
-
-        # Use temp file for original paper (so we can analyze before encryption)
-        tmp_path = None
-        enc_path = None
-        try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(paper.name)[1]) as tmp:
-                for chunk in paper.chunks():
-                    tmp.write(chunk)
-                tmp_path = tmp.name
-            logger.debug("TeacherUploadPaper: saved temp uploaded file to %s", tmp_path)
-
-            # --- Run comprehensive scrutiny analysis BEFORE encryption / IPFS upload ---
-            scrutiny_result = None
-            try:
-                if perform_automatic_scrutiny:
-                    logger.info("TeacherUploadPaper: Starting scrutiny analysis for request %s", r.id)
-                    logger.info("TeacherUploadPaper: Temp file path: %s", tmp_path)
-                    logger.info("TeacherUploadPaper: File exists: %s", os.path.exists(tmp_path))
-                    
-                    scrutiny_result = perform_automatic_scrutiny(r, tmp_path)
-                    if scrutiny_result:
-                        logger.info("TeacherUploadPaper: scrutiny analysis completed successfully for request %s", r.id)
-                    else:
-                        logger.warning("TeacherUploadPaper: scrutiny analysis failed for request %s", r.id)
-                else:
-                    logger.warning("TeacherUploadPaper: comprehensive scrutiny not available")
-            except Exception as e:
-                logger.exception("TeacherUploadPaper: comprehensive scrutiny analysis failed: %s", str(e))
-                logger.error("TeacherUploadPaper: Scrutiny error details - Request ID: %s, Temp path: %s", r.id, tmp_path)
-                # Don't fail the upload if scrutiny fails - just log the error
-
-            # --- Encrypt file and write encrypted bytes to file inside ENCRYPTION_ROOT ---
-            # We try to call your encrypt_file function as before, but we ensure the encrypted path exists.
-            enc_name = f"{paper.name}.encrypted"
-            enc_path = os.path.join(settings.ENCRYPTION_ROOT, enc_name)
-            try:
-                # We assume encrypt_file accepts a file-like object and returns an encryption key (same as before).
-                # To be safe, pass a wrapper that provides read(). If encrypt_file writes file itself, enc_path may already exist.
-                with open(tmp_path, "rb") as f:
-                    class _F:
-                        def __init__(self, fobj, name): self._f, self._n = fobj, name
-                        def read(self): 
-                            self._f.seek(0)
-                            return self._f.read()
-                        def __str__(self): 
-                            return os.path.basename(self._n)
-                    key = encrypt_file(_F(f, paper.name))
-                logger.debug("TeacherUploadPaper: encrypt_file returned key (len=%s)", None if key is None else (len(key) if isinstance(key, (bytes, bytearray)) else "non-bytes"))
-            except Exception as e:
-                logger.exception("TeacherUploadPaper: encryption failed: %s", str(e))
-                return Response({"detail":"encryption failed","error":str(e)}, status=500)
-
-            # NOTE: if your encrypt_file writes an encrypted file to ENCRYPTION_ROOT with the expected name,
-            # enc_path will already exist. If your encrypt_file returns the encrypted bytes instead, adapt below to write them.
-            # For safety: if enc_path not present, attempt to create it by re-running a best-effort write (if encrypt_file returned bytes)
-            if not os.path.exists(enc_path):
-                logger.debug("TeacherUploadPaper: encrypted file not found at expected path %s - attempting to create a placeholder encrypted file", enc_path)
-                try:
-                    # best-effort: if encrypt_file returned bytes (key is tuple or dict), handle here
-                    # But if nothing to write, continue — add_file may fail which we catch below.
-                    # We write a small placeholder to avoid crash (not ideal). Log a warning.
-                    with open(enc_path, "wb") as ef:
-                        ef.write(b"")  # placeholder; ideally your encrypt_file should write the real encrypted data
-                    logger.warning("TeacherUploadPaper: placeholder encrypted file created at %s (please ensure encrypt_file writes encrypted file to ENCRYPTION_ROOT)", enc_path)
-                except Exception as e:
-                    logger.exception("TeacherUploadPaper: failed to create placeholder encrypted file: %s", str(e))
-
-            # --- Upload encrypted file to IPFS/MFS ---
-            mfs_file_path = f"/uploads/{enc_name}"
-            try:
-                logger.debug("TeacherUploadPaper: calling add_file with enc_path=%s mfs_path=%s", enc_path, mfs_file_path)
-                res = add_file(enc_path, mfs_path=mfs_file_path)
-                cid = res.get("Hash") if isinstance(res, dict) else None
-                if not cid:
-                    logger.error("TeacherUploadPaper: add_file returned no CID; response: %s", res)
-                    return Response({"detail":"ipfs upload failed","ipfs_response":res}, status=500)
-                logger.info("TeacherUploadPaper: uploaded to IPFS cid=%s", cid)
-            except Exception as e:
-                logger.exception("TeacherUploadPaper: IPFS upload failed: %s", str(e))
-                return Response({"detail":"ipfs upload failed","error":str(e)}, status=500)
-
-            # RSA-encrypt metadata and save teacher private key file to Request.private_key
-            try:
-                arr = a_encryption(cid, key, request.user.teacher_id)
-                priv_path = os.path.join(settings.ENCRYPTION_ROOT, f"{request.user.teacher_id}_private_key.pem")
-                with open(priv_path, "rb") as pf:
-                    r.private_key.save(os.path.basename(priv_path), File(pf), save=True)
-                r.enc_field = arr
-                r.status = "Uploaded"
-                r.save()
-                logger.info("TeacherUploadPaper: Request %s marked Uploaded; saved private_key and enc_field", r.id)
-            except Exception as e:
-                logger.exception("TeacherUploadPaper: a_encryption or saving private key failed: %s", str(e))
-                # continue — we have IPFS CID, but encryption metadata failed; return partial success
-                return Response({"message":"Uploaded to IPFS but metadata saving failed", "cid": cid, "error": str(e)}, status=207)
-
-            # try record on blockchain (non-blocking)
-            try:
-                record_cid(r.s_code, cid)
-            except Exception:
-                logger.exception("TeacherUploadPaper: blockchain record failed (ignored)")
-
-            # cleanup temporary files
-            try:
-                if os.path.exists(tmp_path):
-                    os.remove(tmp_path)
-                if os.path.exists(enc_path):
-                    # do NOT remove enc_path if you expect it persisted; optionally keep or remove.
-                    # For now, remove to avoid disk accumulation (since file is on IPFS and private key saved).
-                    os.remove(enc_path)
-            except Exception:
-                logger.exception("TeacherUploadPaper: cleanup failed")
-
-            # Return full response (including scrutiny analysis summary)
-            scrutiny_summary = scrutiny_result.summary if scrutiny_result else {"message": "Scrutiny analysis not available"}
-            return Response({"message": "Uploaded", "cid": cid, "mfs_path": mfs_file_path, "scrutiny": scrutiny_summary}, status=201)
-
-        except Exception as e:
-            logger.exception("TeacherUploadPaper: Unhandled exception: %s", str(e))
-            # Cleanup any temp resources
-            try:
-                if tmp_path and os.path.exists(tmp_path):
-                    os.remove(tmp_path)
-            except Exception:
-                pass
-            return Response({"detail":"internal server error","error": str(e)}, status=500)
-
-
+@replica_reads
 class TeacherMyFinalPapers(generics.ListAPIView):
+    authentication_classes = CLAIMS_AUTH
     permission_classes = [IsAuthenticated]
     serializer_class = FinalPaperSerializer
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         user = self.request.user
@@ -265,24 +144,25 @@ class TeacherMyFinalPapers(generics.ListAPIView):
 
 
 # -------- COE -----------
+@replica_reads
 class COEListRequests(generics.ListAPIView):
     """
     Return all active (non-finalized) requests for COE dashboard.
     Active = Pending, Accepted, Uploaded (but not finalized).
     """
+    authentication_classes = CLAIMS_AUTH
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
 
-    def list(self, request, *args, **kwargs):
-        reqs = Request.objects.filter(status__in=["Pending", "Accepted", "Uploaded"]).order_by("-id")
+    def get_queryset(self):
+        return Request.objects.filter(status__in=ACTIVE_STATUSES).select_related("teacher").order_by("-id")
+
+    @staticmethod
+    def _rows(reqs):
         response_data = []
         for r in reqs:
-            try:
-                u = User.objects.get(username=r.tusername)
-                first_name = u.first_name
-                last_name = u.last_name
-            except User.DoesNotExist:
-                first_name = ""
-                last_name = ""
+            first_name = r.teacher.first_name if r.teacher else ""
+            last_name = r.teacher.last_name if r.teacher else ""
             response_data.append({
                 "id": r.id,
                 "s_code": r.s_code,
@@ -292,10 +172,67 @@ class COEListRequests(generics.ListAPIView):
                 "status": r.status,
                 "deadline": r.deadline,
             })
-        return Response(response_data)
+        return response_data
+
+    def list(self, request, *args, **kwargs):
+        def full():
+            page = self.paginate_queryset(self.get_queryset())
+            return self.get_paginated_response(self._rows(page))
+        return sync_response(request, "exams.request", self.get_queryset(), self._rows, full)
+
+
+@replica_reads
+@api_view(["GET"])
+@authentication_classes(CLAIMS_AUTH)
+@permission_classes([IsAuthenticated])
+def COEDashboard(request):
+    """
+    Everything the COE page needs in one response, from a fixed number of
+    queries regardless of data size: the newest active requests, per-subject
+    request/candidate counts, the latest scrutiny scores and the summary
+    stats from the counters table. ?limit= caps the two lists.
+    """
+    if request.user.role != "coe":
+        return Response({"detail": "Not allowed"}, status=403)
+    try:
+        limit = min(int(request.query_params.get("limit", settings.API_PAGE_SIZE)), settings.API_MAX_PAGE_SIZE)
+    except ValueError:
+        return Response({"detail": "limit must be an integer"}, status=400)
+
+    active = Request.objects.filter(status__in=ACTIVE_STATUSES)
+    requests = COEListRequests._rows(active.select_related("teacher").order_by("-id")[:limit])
+    subjects = list(
+        active.values("s_code")
+        .annotate(
+            pending=Count("id", filter=Q(status="Pending")),
+            accepted=Count("id", filter=Q(status="Accepted")),
+            uploaded=Count("id", filter=Q(status="Uploaded")),
+            # one candidate per teacher, as in coe/candidates/
+            candidates=Count("tusername", filter=Q(status="Uploaded"), distinct=True),
+        )
+        .order_by("s_code")
+    )
+
+    latest_scores, summary = [], None
+    if ScrutinyResult:
+        latest_scores = list(
+            ScrutinyResult.objects.order_by("-created_at", "-id").values(
+                "id", "request_obj_id", "s_code", "overall_score", "plagiarism_score", "quality_status", "created_at"
+            )[:limit]
+        )
+    if get_scrutiny_summary_for_dashboard:
+        summary = get_scrutiny_summary_for_dashboard()
+
+    return Response({
+        "requests": requests,
+        "subjects": subjects,
+        "latest_scores": latest_scores,
+        "summary": summary,
+    })
 
 
 @api_view(["POST"])
+@authentication_classes(CLAIMS_AUTH)
 @permission_classes([IsAuthenticated])
 def COEGetTeachers(request):
     course = request.data.get('course')
@@ -306,28 +243,26 @@ def COEGetTeachers(request):
     if not (course and semester and branch and subject):
         return Response({"detail": "course, semester, branch, subject are required"}, status=400)
 
-    sqs = SubjectCode.objects.filter(subject=subject).values()
-    if not sqs:
+    by_subject = ref_cache.subject_code_by_subject(subject)
+    if not by_subject:
         return Response({"detail": "Subject not found in codes"}, status=404)
-    s_code = sqs[0]['s_code']
+    s_code = by_subject.s_code
 
-    active_tusernames = list(
-        Request.objects.filter(s_code=s_code, status__in=["Pending", "Accepted", "Uploaded"])
-        .values_list('tusername', flat=True)
-        .distinct()
-    )
+    active_teachers = set(Request.objects.filter(
+        s_code=s_code, status__in=ACTIVE_STATUSES, teacher__isnull=False
+    ).values_list('teacher_id', flat=True))
 
     uploaded_ids = list(Request.objects.filter(s_code=s_code, status='Uploaded').values('id'))
 
-    queryset = User.objects.filter(
-        course=course, semester=semester, branch=branch, subject=subject
-    ).exclude(username__in=active_tusernames).values(
-        'id', 'username', 'first_name', 'last_name', 'teacher_id'
-    )
+    # the profile search is cached; who is busy changes often, so it is applied per call
+    teachers = [
+        t for t in ref_cache.teachers_for_profile(course, semester, branch, subject)
+        if t['id'] not in active_teachers
+    ]
 
     default_syllabus_url = None
     default_q_pattern_url = None
-    subj_obj = SubjectCode.objects.filter(s_code=s_code).first()
+    subj_obj = ref_cache.subject_code_by_code(s_code)
     if subj_obj:
         try:
             if subj_obj.syllabus:
@@ -345,7 +280,7 @@ def COEGetTeachers(request):
             default_q_pattern_url = None
 
     return Response({
-        'teachers': list(queryset),
+        'teachers': teachers,
         's_code': s_code,
         'uploaded_request_ids': uploaded_ids,
         'default_syllabus_url': default_syllabus_url,
@@ -366,12 +301,12 @@ def COEAddTeacher(request):
     if not (s_code and t_id and deadline):
         return Response({"detail":"missing fields"}, status=400)
 
-    u = User.objects.filter(id=t_id).values('username')
-    if not u:
+    teacher = User.objects.filter(id=t_id).first()
+    if not teacher:
         return Response({"detail":"teacher not found"}, status=404)
-    username = u[0]['username']
+    username = teacher.username
 
-    subj_obj = SubjectCode.objects.filter(s_code=s_code).first()
+    subj_obj = ref_cache.subject_code_by_code(s_code)
     if (not syllabus_file or not q_pattern_file):
         if not subj_obj:
             return Response({"detail":"Subject code not found"}, status=404)
@@ -385,6 +320,7 @@ def COEAddTeacher(request):
 
     obj = Request.objects.create(
         tusername=username,
+        teacher=teacher,
         s_code=s_code,
         syllabus=syllabus_file,
         q_pattern=q_pattern_file,
@@ -392,125 +328,227 @@ def COEAddTeacher(request):
         status="Pending",
         total_marks=int(total_marks) if total_marks is not None else 100
     )
-    new_teacher = User.objects.filter(username=username).values()
+    new_teacher = User.objects.filter(id=teacher.id).values()
     return Response({'new_teacher': list(new_teacher), 'request_id': obj.id}, status=201)
 
 
-@api_view(["GET"])
+@api_view(["POST"])
 @permission_classes([IsAuthenticated])
-def COECandidates(request):
-    s_code = request.query_params.get("s_code")
-    if not s_code:
-        return Response({"detail":"s_code query param required"}, status=400)
-
-    uploaded_qs = Request.objects.filter(s_code=s_code, status='Uploaded').order_by("id")
-    if not uploaded_qs.exists():
-        return Response({"detail":"No uploaded candidates for this s_code"}, status=404)
-
-    latest_by_teacher = {}
-    for r in uploaded_qs:
-        latest_by_teacher[r.tusername] = r
-
-    candidates_list = sorted(latest_by_teacher.values(), key=lambda x: x.id)
-
-    response = []
-
-    def _quality_status(score: float) -> str:
-        if score >= 0.8:
-            return "excellent"
-        if score >= 0.6:
-            return "good"
-        if score >= 0.4:
-            return "fair"
-        return "poor"
-
-    for idx, r in enumerate(candidates_list):
-        try:
-            u = User.objects.get(username=r.tusername)
-            tname = f"{u.first_name} {u.last_name}".strip()
-        except User.DoesNotExist:
-            tname = r.tusername
-
-        scrutiny_payload = None
-        if ScrutinyResult:
-            scrutiny_obj = ScrutinyResult.objects.filter(request_obj=r).order_by("-created_at").first()
-            if scrutiny_obj:
-                summary = scrutiny_obj.summary or {}
-                overall_score = summary.get("overall_score", 0.0) or 0.0
-                plagiarism_score = summary.get("plagiarism_analysis", {}).get("plagiarism_score", 0.0) or 0.0
-                scrutiny_payload = {
-                    "score": round(overall_score, 2),
-                    "score_percent": round(overall_score * 100, 1),
-                    "quality": _quality_status(overall_score),
-                    "plagiarism_score": round(plagiarism_score, 2),
-                    "plagiarism_percent": round(plagiarism_score * 100, 1),
-                    "summary": summary,
-                    "created_at": scrutiny_obj.created_at,
-                }
-
-        response.append({
-            "id": r.id,
-            "teacher_username": r.tusername,
-            "teacher_name": tname,
-            "paper_number": f"Paper {idx+1}",
-            "status": r.status,
-            "deadline": r.deadline,
-            "total_marks": r.total_marks,
-            "syllabus_url": r.syllabus.url if r.syllabus else None,
-            "q_pattern_url": r.q_pattern.url if r.q_pattern else None,
-            "scrutiny": scrutiny_payload,
-        })
-    return Response(response)
+def COEBulkAssign(request):
+    """
+    Create many Pending requests at once using each subject's default
+    syllabus/q_pattern. Body: {"assignments": [{"teacher": <user id>,
+    "s_code": ..., "deadline": "YYYY-MM-DD", "total_marks": 100}, ...]}.
+    """
+    if request.user.role != "coe":
+        return Response({"detail": "Not allowed"}, status=403)
+    rows = request.data.get("assignments")
+    if not isinstance(rows, list) or not rows:
+        return Response({"detail": "assignments list is required"}, status=400)
+    if len(rows) > MAX_ASSIGNMENTS:
+        return Response({"detail": f"at most {MAX_ASSIGNMENTS} assignments per call"}, status=400)
+    report = assign_requests(rows)
+    if not report["created"]:
+        code = 400
+    elif report["errors"]:
+        code = 207
+    else:
+        code = 201
+    return Response(report, status=code)
+
+
+def candidates_queryset(s_code, summary_paths=None):
+    """
+    Latest Uploaded request per teacher for s_code, with the teacher name and
+    the latest scrutiny result joined in, as a single SQL statement.
+    summary_paths: None for the whole scrutiny summary, [] to leave it out,
+    or key tuples to project (scrutiny/fieldsets.py).
+    """
+    latest_per_teacher = (
+        Request.objects.filter(s_code=s_code, status='Uploaded')
+        .order_by("tusername", "-id")
+        .distinct("tusername")
+        .values("id")
+    )
+    qs = Request.objects.filter(id__in=Subquery(latest_per_teacher)).annotate(
+        teacher_first_name=F("teacher__first_name"),
+        teacher_last_name=F("teacher__last_name"),
+    )
+    if ScrutinyResult:
+        latest_scrutiny = ScrutinyResult.objects.filter(request_obj=OuterRef("pk")).order_by("-created_at")
+        if summary_paths is None:
+            qs = qs.annotate(scrutiny_summary=Subquery(latest_scrutiny.values("summary")[:1]))
+        elif summary_paths:
+            projected = latest_scrutiny.annotate(projected_summary=summary_projection(summary_paths))
+            qs = qs.annotate(scrutiny_summary=Subquery(projected.values("projected_summary")[:1]))
+        qs = qs.annotate(
+            scrutiny_overall_score=Subquery(latest_scrutiny.values("overall_score")[:1]),
+            scrutiny_plagiarism_score=Subquery(latest_scrutiny.values("plagiarism_score")[:1]),
+            scrutiny_quality_status=Subquery(latest_scrutiny.values("quality_status")[:1]),
+            scrutiny_created_at=Subquery(latest_scrutiny.values("created_at")[:1]),
+        )
+    return qs.order_by("id")
+
+
+def _candidate_payload(idx, r):
+    if r.teacher_id:
+        tname = f"{r.teacher_first_name or ''} {r.teacher_last_name or ''}".strip()
+    else:
+        tname = r.tusername
+
+    scrutiny_payload = None
+    if getattr(r, "scrutiny_created_at", None) is not None:
+        overall_score = r.scrutiny_overall_score or 0.0
+        plagiarism_score = r.scrutiny_plagiarism_score or 0.0
+        scrutiny_payload = {
+            "score": round(overall_score, 2),
+            "score_percent": round(overall_score * 100, 1),
+            "quality": r.scrutiny_quality_status,
+            "plagiarism_score": round(plagiarism_score, 2),
+            "plagiarism_percent": round(plagiarism_score * 100, 1),
+            "created_at": r.scrutiny_created_at,
+        }
+        if hasattr(r, "scrutiny_summary"):
+            scrutiny_payload["summary"] = r.scrutiny_summary or {}
+
+    return {
+        "id": r.id,
+        "teacher_username": r.tusername,
+        "teacher_name": tname,
+        "paper_number": f"Paper {idx+1}",
+        "status": r.status,
+        "deadline": r.deadline,
+        "total_marks": r.total_marks,
+        "syllabus_url": r.syllabus.url if r.syllabus else None,
+        "q_pattern_url": r.q_pattern.url if r.q_pattern else None,
+        "scrutiny": scrutiny_payload,
+    }
 
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
-def COEFinalize(request, req_id):
-    req = Request.objects.filter(id=req_id).first()
-    if not req:
-        return Response({"detail":"Not found"}, status=404)
-    if req.status != "Uploaded":
-        return Response({"detail":"Only Uploaded requests can be finalized"}, status=400)
-
-    values = a_decryption([req.enc_field, req.private_key])
-    key = values[0]
-    cid = values[1].decode("utf-8")
-    enc_bytes = get_file(cid)
-
-    class _R:
-        def __init__(self, b): self.text = b.decode("latin1")
-    rfake = _R(enc_bytes)
-    pdf_file = decrypt_file(rfake, key, req.s_code)
-
-    teacher = User.objects.filter(username=req.tusername).values("course","semester","branch","subject")[0]
-    final = FinalPapers.objects.create(
-        s_code=req.s_code,
-        course=teacher["course"],
-        semester=teacher["semester"],
-        branch=teacher["branch"],
-        subject=teacher["subject"],
-    )
-    final.paper.save(f"{req.s_code}.pdf", pdf_file, save=True)
+@parser_classes([MultiPartParser, FormParser])
+def COEImportTeachers(request):
+    """
+    Bulk-create teachers from an uploaded CSV (field "file"). Password
+    hashing is slow, so the import runs in the background: the response is
+    202 with a job id to poll at coe/teachers/import/<job>/.
+    """
+    if request.user.role != "coe":
+        return Response({"detail": "Not allowed"}, status=403)
+    upload = request.FILES.get("file")
+    if not upload:
+        return Response({"detail": "file is required"}, status=400)
+    rows = read_csv(io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline=""))
+    if not rows:
+        return Response({"detail": "CSV has no rows"}, status=400)
+    job_id = submit_import(rows)
+    return Response({"job": job_id, "status": "running"}, status=202)
 
-    Request.objects.filter(s_code=req.s_code).exclude(id=req.id).delete()
-    req.status = "Finalized"
-    req.save()
 
-    return Response({"message": "Finalized", "paper_id": final.id})
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def COEImportTeachersStatus(request, job_id):
+    """Progress of a COEImportTeachers job; the per-row report once it is done."""
+    if request.user.role != "coe":
+        return Response({"detail": "Not allowed"}, status=403)
+    job = import_status(job_id)
+    if job is None:
+        return Response({"detail": "Not found"}, status=404)
+    return Response({"job": job_id, **job})
 
 
 # ----- SUPERINTENDENT -----
+@replica_reads
 class SuperintendentListFinal(generics.ListAPIView):
+    authentication_classes = CLAIMS_AUTH
     permission_classes = [IsAuthenticated]
     serializer_class = FinalPaperSerializer
+    pagination_class = KeysetPagination
     queryset = FinalPapers.objects.all().order_by("-id")
 
+    def list(self, request, *args, **kwargs):
+        def serialize(rows):
+            return self.get_serializer(rows, many=True).data
+        return sync_response(
+            request, "exams.finalpapers", self.get_queryset(), serialize,
+            lambda: super(SuperintendentListFinal, self).list(request, *args, **kwargs),
+            etag_salt=str(url_epoch()),  # rows carry expiring signed URLs
+        )
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
-def SuperintendentGetDecryptInfo(request, paper_id):
-    fp = FinalPapers.objects.filter(id=paper_id).first()
-    if not fp: return Response({"detail": "Not found"}, status=404)
-    return Response({
-        "s_code": fp.s_code,
-        "paper_url": fp.paper.url if fp.paper else None
-    })
+def SuperintendentBundle(request):
+    """
+    Stream a ZIP of every final paper matching ?course=&semester=&branch=,
+    with manifest.json (sha256 per paper) as the last member. Supports Range
+    and If-Range, so interrupted downloads can resume.
+    """
+    if request.user.role not in ("coe", "superintendent"):
+        return Response({"detail": "Not allowed"}, status=403)
+    filters = {k: request.query_params[k] for k in ("course", "semester", "branch") if request.query_params.get(k)}
+    if not filters:
+        return Response({"detail": "at least one of course, semester, branch is required"}, status=400)
+
+    papers = [
+        fp for fp in FinalPapers.objects.filter(**filters).exclude(paper="").order_by("id")
+        if fp.paper
+    ]
+    if not papers:
+        return Response({"detail": "No final papers match these filters"}, status=404)
+    filename = "final-papers-" + "-".join(_safe(v) for v in filters.values()) + ".zip"
+    try:
+        return bundle_response(request, papers, filename)
+    except BundleTooLarge as e:
+        return Response({"detail": f"{e}; narrow the filters"}, status=400)
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def VerifyPaperHistory(request):
+    """
+    Check finalized papers against the locally indexed PaperRecorded history
+    (see `manage.py index_paper_events`). Body: {"s_codes": [...]}.
+    """
+    if request.user.role not in ("coe", "superintendent"):
+        return Response({"detail": "Not allowed"}, status=403)
+    s_codes = request.data.get("s_codes")
+    if not isinstance(s_codes, list) or not s_codes:
+        return Response({"detail": "s_codes list is required"}, status=400)
+    s_codes = list(dict.fromkeys(str(c) for c in s_codes))
+    return Response({"results": verify_s_codes(s_codes)})
+
+
+@replica_reads
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def COEExport(request, dataset):
+    """
+    Stream scrutiny results or requests as CSV or XLSX (?output=csv|xlsx),
+    filtered by ?s_code= and ?since=/?until= (YYYY-MM-DD; scrutiny date for
+    results, deadline for requests).
+    """
+    if request.user.role != "coe":
+        return Response({"detail": "Not allowed"}, status=403)
+    fmt = request.query_params.get("output", "csv")
+    if fmt not in FORMATS:
+        return Response({"detail": "output must be csv or xlsx"}, status=400)
+    try:
+        # the body is read after the view returns, so bind the database alias now
+        headers, rows = export_rows(dataset, request.query_params, using=current_read_alias())
+    except ValueError as e:
+        return Response({"detail": str(e)}, status=400)
+
+    body = iter_csv(headers, rows) if fmt == "csv" else iter_xlsx(headers, rows, sheet_name=dataset)
+    response = StreamingHttpResponse(body, content_type=FORMATS[fmt])
+    response["Content-Disposition"] = f'attachment; filename="{dataset}.{fmt}"'
+    return response
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def CacheStats(request):
+    """Reference-data cache hit ratios for this worker process."""
+    if request.user.role != "coe":
+        return Response({"detail": "Not allowed"}, status=403)
+    return Response(ref_cache.stats())
@@ -0,0 +1,291 @@
+# backend/exams/views_async.py
+#
+# Async versions of the I/O-bound exam workflow endpoints. They are plain
+# Django async views (DRF views are sync-only), so under ASGI an IPFS or
+# chain wait parks a coroutine instead of holding a worker thread.
+import asyncio
+import logging
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.files import File
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, transaction
+from django.http import JsonResponse
+
+from .authentication import authenticate_request
+from .models import Request, FinalPapers
+from .encryption import encrypt_file, FernetStreamDecryptor, InvalidToken
+from .a_encryption import a_encryption, a_decryption
+from .ipfs_utils import add_file_async, stream_file_async
+from .blockchain import record_cid
+from .downloads import signed_download_url
+from .views_api import candidates_queryset, _candidate_payload
+from ems.db_router import replica_reads
+
+try:
+    from scrutiny.scrutiny_utils import perform_automatic_scrutiny
+except Exception:
+    perform_automatic_scrutiny = None
+from scrutiny.fieldsets import parse_fields
+
+logger = logging.getLogger(__name__)
+
+# NLP scrutiny is CPU-bound; keep it off the event loop and bound its concurrency
+SCRUTINY_EXECUTOR = ThreadPoolExecutor(max_workers=settings.SCRUTINY_WORKERS, thread_name_prefix="scrutiny")
+
+
+def _json(data, status=200):
+    return JsonResponse(data, status=status, safe=False, encoder=DjangoJSONEncoder)
+
+
+def _api(*methods):
+    """Method check plus CSRF exemption (auth is by bearer token, as in DRF views)."""
+    def decorator(view):
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in methods:
+                return _json({"detail": f'Method "{request.method}" not allowed.'}, status=405)
+            request.user = await sync_to_async(authenticate_request)(request)
+            if request.user is None:
+                return _json({"detail": "Authentication credentials were not provided."}, status=401)
+            return await view(request, *args, **kwargs)
+        wrapper.csrf_exempt = True
+        wrapper.__name__ = view.__name__
+        wrapper.__doc__ = view.__doc__
+        return wrapper
+    return decorator
+
+
+def _run_scrutiny(req, path):
+    # executor threads are outside the request cycle, so manage their DB connection here
+    close_old_connections()
+    try:
+        return perform_automatic_scrutiny(req, path)
+    finally:
+        close_old_connections()
+
+
+def _save_temp(paper):
+    with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(paper.name)[1]) as tmp:
+        for chunk in paper.chunks():
+            tmp.write(chunk)
+        return tmp.name
+
+
+def _encrypt(tmp_path, name):
+    with open(tmp_path, "rb") as f:
+        class _F:
+            def read(self):
+                f.seek(0)
+                return f.read()
+            def __str__(self):
+                return os.path.basename(name)
+        key = encrypt_file(_F())
+    return key, os.path.join(settings.ENCRYPTION_ROOT, f"{name}.encrypted")
+
+
+def _save_metadata(r, cid, key, teacher_id):
+    arr = a_encryption(cid, key, teacher_id)
+    priv_path = os.path.join(settings.ENCRYPTION_ROOT, f"{teacher_id}_private_key.pem")
+    with open(priv_path, "rb") as pf:
+        r.private_key.save(os.path.basename(priv_path), File(pf), save=False)
+    r.enc_field = arr
+    r.status = "Uploaded"
+    r.save()
+
+
+def _cleanup(*paths):
+    for path in paths:
+        try:
+            if path and os.path.exists(path):
+                os.remove(path)
+        except OSError:
+            logger.exception("upload_paper: cleanup failed for %s", path)
+
+
+@_api("POST")
+async def upload_paper(request, req_id):
+    user = request.user
+    r = await Request.objects.filter(id=req_id, teacher=user).afirst()
+    if not r:
+        return _json({"detail": "Request not found"}, status=404)
+    if r.status != "Accepted":
+        return _json({"detail": "Upload allowed only for Accepted requests"}, status=400)
+
+    paper = request.FILES.get("paper")
+    if not paper:
+        return _json({"detail": "paper is required"}, status=400)
+
+    loop = asyncio.get_running_loop()
+    tmp_path = enc_path = None
+    try:
+        tmp_path = await sync_to_async(_save_temp, thread_sensitive=False)(paper)
+
+        # Scrutiny runs before encryption so it sees the plain paper; failure does not block the upload
+        scrutiny_result = None
+        if perform_automatic_scrutiny:
+            try:
+                scrutiny_result = await loop.run_in_executor(SCRUTINY_EXECUTOR, _run_scrutiny, r, tmp_path)
+            except Exception:
+                logger.exception("upload_paper: scrutiny failed for request %s", r.id)
+        else:
+            logger.warning("upload_paper: comprehensive scrutiny not available")
+
+        try:
+            key, enc_path = await sync_to_async(_encrypt, thread_sensitive=False)(tmp_path, paper.name)
+        except Exception as e:
+            logger.exception("upload_paper: encryption failed")
+            return _json({"detail": "encryption failed", "error": str(e)}, status=500)
+
+        mfs_file_path = f"/uploads/{os.path.basename(enc_path)}"
+        try:
+            res = await add_file_async(enc_path, mfs_path=mfs_file_path)
+            cid = res.get("Hash") if isinstance(res, dict) else None
+            if not cid:
+                return _json({"detail": "ipfs upload failed", "ipfs_response": res}, status=500)
+        except Exception as e:
+            logger.exception("upload_paper: IPFS upload failed")
+            return _json({"detail": "ipfs upload failed", "error": str(e)}, status=500)
+
+        try:
+            await sync_to_async(_save_metadata)(r, cid, key, user.teacher_id)
+        except Exception as e:
+            logger.exception("upload_paper: a_encryption or saving private key failed")
+            return _json({"message": "Uploaded to IPFS but metadata saving failed", "cid": cid, "error": str(e)}, status=207)
+
+        try:
+            await sync_to_async(record_cid, thread_sensitive=False)(r.s_code, cid)
+        except Exception:
+            logger.exception("upload_paper: blockchain record failed (ignored)")
+
+        scrutiny_summary = scrutiny_result.summary if scrutiny_result else {"message": "Scrutiny analysis not available"}
+        return _json({"message": "Uploaded", "cid": cid, "mfs_path": mfs_file_path, "scrutiny": scrutiny_summary}, status=201)
+    except Exception as e:
+        logger.exception("upload_paper: unhandled exception")
+        return _json({"detail": "internal server error", "error": str(e)}, status=500)
+    finally:
+        await sync_to_async(_cleanup, thread_sensitive=False)(tmp_path, enc_path)
+
+
+def _candidate_summary_paths(params):
+    """?view=summary drops the scrutiny summary document, ?fields=summary.<key>,... projects it."""
+    if params.get("view") == "summary":
+        return []
+    if params.get("fields"):
+        _fields, paths = parse_fields({"fields": params["fields"]}, {"summary"})
+        return paths
+    return None
+
+
+@replica_reads
+@_api("GET")
+async def candidates(request):
+    s_code = request.GET.get("s_code")
+    if not s_code:
+        return _json({"detail": "s_code query param required"}, status=400)
+    try:
+        summary_paths = _candidate_summary_paths(request.GET)
+    except ValueError as e:
+        return _json({"detail": str(e)}, status=400)
+    rows = [r async for r in candidates_queryset(s_code, summary_paths)]
+    if not rows:
+        return _json({"detail": "No uploaded candidates for this s_code"}, status=404)
+    return _json([_candidate_payload(idx, r) for idx, r in enumerate(rows)])
+
+
+async def _decrypt_to_spool(cid, key):
+    """
+    Stream the encrypted paper from IPFS through the Fernet decryptor into a
+    spooled temp file (memory up to FINALIZE_SPOOL_MAX_BYTES, then the system
+    temp dir). Neither the ciphertext nor a latin1 copy of it is held whole.
+    """
+    decryptor = FernetStreamDecryptor(key)
+    spool = tempfile.SpooledTemporaryFile(max_size=settings.FINALIZE_SPOOL_MAX_BYTES)
+    try:
+        async for chunk in stream_file_async(cid):
+            spool.write(decryptor.update(chunk))
+        spool.write(decryptor.finalize())
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    in_memory = decryptor.bytes_out if decryptor.bytes_out <= settings.FINALIZE_SPOOL_MAX_BYTES else 0
+    stats = {
+        "bytes_in": decryptor.bytes_in,
+        "bytes_out": decryptor.bytes_out,
+        "peak_memory_bytes": decryptor.peak_buffer + in_memory,
+    }
+    return spool, stats
+
+
+def _finalize_sync(req_id, cid, plaintext):
+    """Store the paper and close out the s_code under a row lock; None if the request moved on."""
+    with transaction.atomic():
+        req = (
+            Request.objects.select_for_update(of=("self",))
+            .select_related("teacher")
+            .filter(id=req_id, status="Uploaded")
+            .first()
+        )
+        if req is None or req.teacher is None:
+            return None
+        teacher = req.teacher
+        final = FinalPapers.objects.create(
+            s_code=req.s_code,
+            cid=cid,
+            course=teacher.course,
+            semester=teacher.semester,
+            branch=teacher.branch,
+            subject=teacher.subject,
+        )
+        final.paper.save(f"{req.s_code}.pdf", File(plaintext, name=f"{req.s_code}.pdf"), save=True)
+
+        Request.objects.filter(s_code=req.s_code).exclude(id=req.id).delete()
+        req.status = "Finalized"
+        req.save()
+        return final.id
+
+
+@_api("POST")
+async def finalize(request, req_id):
+    req = await Request.objects.filter(id=req_id).select_related("teacher").afirst()
+    if not req:
+        return _json({"detail": "Not found"}, status=404)
+    if req.teacher is None:
+        return _json({"detail": "Teacher for this request no longer exists"}, status=400)
+    if req.status != "Uploaded":
+        return _json({"detail": "Only Uploaded requests can be finalized"}, status=400)
+
+    key, hash_id = await sync_to_async(a_decryption, thread_sensitive=False)([req.enc_field, req.private_key])
+    cid = hash_id.decode("utf-8")
+
+    # decrypt before taking the row lock so the lock is never held across the IPFS fetch
+    try:
+        plaintext, stats = await _decrypt_to_spool(cid, key)
+    except InvalidToken:
+        logger.error("finalize: ciphertext for request %s (cid %s) failed authentication", req.id, cid)
+        return _json({"detail": "Stored paper failed integrity check"}, status=502)
+    try:
+        paper_id = await sync_to_async(_finalize_sync)(req.id, cid, plaintext)
+    finally:
+        plaintext.close()
+    if paper_id is None:
+        return _json({"detail": "Request was finalized or changed concurrently"}, status=409)
+
+    logger.info("finalize: request %s -> paper %s %s", req.id, paper_id, stats)
+    return _json({"message": "Finalized", "paper_id": paper_id, "stream": stats})
+
+
+@_api("GET")
+async def decrypt_info(request, paper_id):
+    fp = await FinalPapers.objects.filter(id=paper_id).afirst()
+    if not fp:
+        return _json({"detail": "Not found"}, status=404)
+    return _json({
+        "s_code": fp.s_code,
+        "paper_url": signed_download_url(request, fp) if fp.paper else None,
+        "expires_in": settings.PAPER_DOWNLOAD_URL_TTL,
+    })
@@ -0,0 +1,113 @@
+"""
+Sparse fieldsets for scrutiny payloads.
+
+?fields=id,created_at,summary.num_questions,summary.plagiarism_analysis.plagiarism_score
+?view=summary   (the SUMMARY_VIEW preset below)
+
+Dotted summary paths are projected in the database: the selected keys are
+rebuilt with JSONB_BUILD_OBJECT from `summary -> key` lookups, so the large
+`questions` reports and plagiarism pairs never leave PostgreSQL. The full
+document stays available from scrutiny/detail/<request_id>/.
+"""
+import re
+
+from django.db.models.fields.json import KeyTransform
+from django.db.models.functions import JSONObject
+
+SUMMARY_VIEW = (
+    "id",
+    "request_obj",
+    "request_info",
+    "created_at",
+    "overall_score_display",
+    "quality_status",
+    "summary.num_questions",
+    "summary.overall_score",
+    "summary.quality_status",
+    "summary.plagiarism_analysis.plagiarism_score",
+)
+VIEWS = {"summary": SUMMARY_VIEW}
+
+_KEY = re.compile(r"^[A-Za-z0-9_]+$")
+
+
+def parse_fields(params, allowed):
+    """
+    Read ?view= / ?fields= into (fields, summary_paths).
+
+    fields is the set of top-level names to keep, or None for all of them.
+    summary_paths is None when the whole summary is wanted, [] when it is not
+    wanted at all, otherwise a list of key tuples. Raises ValueError on
+    unknown names.
+    """
+    view = params.get("view")
+    raw = params.get("fields")
+    if view:
+        if view == "full":
+            return None, None
+        if view not in VIEWS:
+            raise ValueError(f"unknown view '{view}'")
+        requested = list(VIEWS[view])
+    elif raw:
+        requested = [f.strip() for f in raw.split(",") if f.strip()]
+    else:
+        return None, None
+
+    fields, paths, whole_summary = set(), [], False
+    for name in requested:
+        head, _, rest = name.partition(".")
+        if head not in allowed:
+            raise ValueError(f"unknown field '{head}'")
+        fields.add(head)
+        if head != "summary":
+            continue
+        if not rest:
+            whole_summary = True
+            continue
+        keys = tuple(rest.split("."))
+        if not all(_KEY.match(k) for k in keys):
+            raise ValueError(f"invalid summary path '{name}'")
+        paths.append(keys)
+    if "summary" not in fields:
+        return fields, []
+    return fields, None if whole_summary else paths
+
+
+def summary_projection(paths, field="summary"):
+    """JSONObject expression rebuilding only `paths` of the JSON column `field`."""
+    tree = {}
+    for keys in paths:
+        node = tree
+        for key in keys[:-1]:
+            node = node.setdefault(key, {})
+            if node is None:
+                break
+        else:
+            node[keys[-1]] = None  # leaf: take the value as stored
+
+    def build(node, source):
+        parts = {}
+        for key, child in node.items():
+            value = KeyTransform(key, source)
+            parts[key] = value if child is None else build(child, value)
+        return JSONObject(**parts)
+
+    return build(tree, field)
+
+
+def project_summary(document, paths):
+    """Python counterpart of summary_projection for an already loaded summary."""
+    def pick(node, keys):
+        for key in keys:
+            if not isinstance(node, dict):
+                return None
+            node = node.get(key)
+        return node
+
+    projected = {}
+    for keys in paths:
+        target = projected
+        for key in keys[:-1]:
+            target = target.setdefault(key, {})
+        target[keys[-1]] = pick(document, keys)
+    return projected
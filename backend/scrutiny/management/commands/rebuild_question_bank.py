@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from scrutiny.question_bank import rebuild_question_bank
+
+
+class Command(BaseCommand):
+    help = "Re-extract the question bank from the stored ScrutinyResult summaries."
+
+    def handle(self, *args, **opts):
+        stored = rebuild_question_bank()
+        self.stdout.write(self.style.SUCCESS(f"indexed {stored} question(s)"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from scrutiny.scrutiny_utils import rebuild_dashboard_counters
+
+
+class Command(BaseCommand):
+    help = "Recompute the scrutiny dashboard rollup table from ScrutinyResult."
+
+    def handle(self, *args, **opts):
+        written = rebuild_dashboard_counters()
+        self.stdout.write(self.style.SUCCESS(f"rebuilt {written} dashboard counter bucket(s)"))
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scrutiny', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='scrutinyresult',
+            index=models.Index(fields=['request_obj', '-created_at'], name='scrutiny_request_latest_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='scrutinyresult',
+            index=models.Index(fields=['-created_at'], name='scrutiny_created_idx'),
+        ),
+    ]
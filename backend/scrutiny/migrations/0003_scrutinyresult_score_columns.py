@@ -0,0 +1,62 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:02
+
+from django.db import migrations, models
+
+
+# Frozen copies of scrutiny.models.scores_from_summary / quality_status_for as of
+# this migration, so later changes to the live helpers cannot alter the backfill.
+def scores_from_summary(summary):
+    summary = summary or {}
+    overall = summary.get('overall_score', 0.0) or 0.0
+    plagiarism = (summary.get('plagiarism_analysis') or {}).get('plagiarism_score', 0.0) or 0.0
+    return float(overall), float(plagiarism)
+
+
+def quality_status_for(score):
+    if score >= 0.8:
+        return "excellent"
+    if score >= 0.6:
+        return "good"
+    if score >= 0.4:
+        return "fair"
+    return "poor"
+
+
+def backfill_scores(apps, schema_editor):
+    ScrutinyResult = apps.get_model('scrutiny', 'ScrutinyResult')
+    batch = []
+    for result in ScrutinyResult.objects.only('id', 'summary').iterator(chunk_size=1000):
+        result.overall_score, result.plagiarism_score = scores_from_summary(result.summary)
+        result.quality_status = quality_status_for(result.overall_score)
+        batch.append(result)
+        if len(batch) >= 1000:
+            ScrutinyResult.objects.bulk_update(batch, ['overall_score', 'plagiarism_score', 'quality_status'])
+            batch = []
+    if batch:
+        ScrutinyResult.objects.bulk_update(batch, ['overall_score', 'plagiarism_score', 'quality_status'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scrutiny', '0002_scrutinyresult_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scrutinyresult',
+            name='overall_score',
+            field=models.FloatField(db_index=True, default=0.0),
+        ),
+        migrations.AddField(
+            model_name='scrutinyresult',
+            name='plagiarism_score',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='scrutinyresult',
+            name='quality_status',
+            field=models.CharField(choices=[('excellent', 'excellent'), ('good', 'good'), ('fair', 'fair'), ('poor', 'poor')], db_index=True, default='poor', max_length=10),
+        ),
+        migrations.RunPython(backfill_scores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:10
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Q, Subquery, Sum
+
+
+def backfill_s_code_and_counters(apps, schema_editor):
+    Request = apps.get_model('exams', 'Request')
+    ScrutinyResult = apps.get_model('scrutiny', 'ScrutinyResult')
+    ScrutinyDashboardCounter = apps.get_model('scrutiny', 'ScrutinyDashboardCounter')
+
+    ScrutinyResult.objects.filter(request_obj__isnull=False).update(
+        s_code=Subquery(Request.objects.filter(pk=OuterRef('request_obj_id')).values('s_code')[:1])
+    )
+    rows = (
+        ScrutinyResult.objects.values('s_code', 'quality_status')
+        .annotate(
+            papers=Count('id'),
+            score_sum=Sum('overall_score'),
+            plagiarism_issues=Count('id', filter=Q(plagiarism_score__gt=0.3)),
+        )
+        .order_by()
+    )
+    ScrutinyDashboardCounter.objects.bulk_create([ScrutinyDashboardCounter(**row) for row in rows])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0010_customuser_user_profile_idx_and_more'),
+        ('scrutiny', '0003_scrutinyresult_score_columns'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scrutinyresult',
+            name='s_code',
+            field=models.CharField(blank=True, default='', max_length=7),
+        ),
+        migrations.CreateModel(
+            name='ScrutinyDashboardCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('s_code', models.CharField(blank=True, default='', max_length=7)),
+                ('quality_status', models.CharField(choices=[('excellent', 'excellent'), ('good', 'good'), ('fair', 'fair'), ('poor', 'poor')], max_length=10)),
+                ('papers', models.IntegerField(default=0)),
+                ('score_sum', models.FloatField(default=0.0)),
+                ('plagiarism_issues', models.IntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('s_code', 'quality_status'), name='scrutiny_counter_bucket_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_s_code_and_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.5 on 2026-10-18 17:50
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scrutiny', '0004_scrutinyresult_s_code_scrutinydashboardcounter'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.CreateModel(
+            name='QuestionBankEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('request_id', models.IntegerField(blank=True, null=True)),
+                ('s_code', models.CharField(blank=True, default='', max_length=7)),
+                ('position', models.PositiveIntegerField(default=0)),
+                ('text', models.TextField()),
+                ('bloom_level', models.CharField(blank=True, default='', max_length=20)),
+                ('difficulty', models.CharField(blank=True, default='', max_length=10)),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('scrutiny_result', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='question_entries', to='scrutiny.scrutinyresult')),
+            ],
+            options={
+                'indexes': [
+                    django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='question_search_idx'),
+                    django.contrib.postgres.indexes.GinIndex(fields=['text'], name='question_text_trgm_idx', opclasses=['gin_trgm_ops']),
+                    models.Index(fields=['s_code', '-created_at'], name='question_scode_created_idx'),
+                ],
+            },
+        ),
+    ]
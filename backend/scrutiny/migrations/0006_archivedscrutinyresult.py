@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-18 18:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scrutiny', '0005_questionbankentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedScrutinyResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.IntegerField(unique=True)),
+                ('request_id', models.IntegerField(blank=True, null=True)),
+                ('s_code', models.CharField(blank=True, default='', max_length=7)),
+                ('overall_score', models.FloatField(default=0.0)),
+                ('plagiarism_score', models.FloatField(default=0.0)),
+                ('quality_status', models.CharField(choices=[('excellent', 'excellent'), ('good', 'good'), ('fair', 'fair'), ('poor', 'poor')], default='poor', max_length=10)),
+                ('summary_codec', models.CharField(max_length=8)),
+                ('summary_blob', models.BinaryField()),
+                ('created_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['request_id', '-created_at'], name='archived_scrutiny_request_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 19:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scrutiny', '0006_archivedscrutinyresult'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='scrutinyresult',
+            name='plagiarism_score',
+            field=models.FloatField(db_index=True, default=0.0),
+        ),
+    ]
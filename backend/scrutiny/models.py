@@ -1,11 +1,142 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.utils.functional import cached_property
+from exams.compression import decompress_json
 from exams.models import Request
 from django.contrib.postgres.fields import JSONField  # If using Django < 4.2; Django 5 has models.JSONField
 
+# Thresholds used by the COE dashboard
+REVIEW_THRESHOLD = 0.6
+PLAGIARISM_ISSUE_THRESHOLD = 0.3
+
+QUALITY_STATUS = (
+    ('excellent', 'excellent'),
+    ('good', 'good'),
+    ('fair', 'fair'),
+    ('poor', 'poor'),
+)
+
+
+def quality_status_for(score: float) -> str:
+    if score >= 0.8:
+        return "excellent"
+    if score >= 0.6:
+        return "good"
+    if score >= 0.4:
+        return "fair"
+    return "poor"
+
+
+def scores_from_summary(summary) -> tuple:
+    """(overall_score, plagiarism_score) as stored in an analysis summary."""
+    summary = summary or {}
+    overall = summary.get('overall_score', 0.0) or 0.0
+    plagiarism = (summary.get('plagiarism_analysis') or {}).get('plagiarism_score', 0.0) or 0.0
+    return float(overall), float(plagiarism)
+
+
 class ScrutinyResult(models.Model):
     request_obj = models.ForeignKey(Request, on_delete=models.CASCADE, null=True, blank=True)
+    s_code = models.CharField(max_length=7, default='', blank=True)
     summary = models.JSONField(default=dict)
+    # Denormalized from summary on save so dashboards can aggregate in SQL
+    overall_score = models.FloatField(default=0.0, db_index=True)
+    plagiarism_score = models.FloatField(default=0.0, db_index=True)
+    quality_status = models.CharField(max_length=10, choices=QUALITY_STATUS, default='poor', db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['request_obj', '-created_at'], name='scrutiny_request_latest_idx'),
+            models.Index(fields=['-created_at'], name='scrutiny_created_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.request_obj_id and not self.s_code:
+            self.s_code = self.request_obj.s_code
+        self.overall_score, self.plagiarism_score = scores_from_summary(self.summary)
+        self.quality_status = quality_status_for(self.overall_score)
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"ScrutinyResult for Request {self.request_obj_id} at {self.created_at}"
+
+
+class ScrutinyDashboardCounter(models.Model):
+    """
+    Running totals per (subject code, quality bucket), kept in step with
+    ScrutinyResult by scrutiny.signals. Repair with
+    `manage.py rebuild_scrutiny_counters`.
+    """
+    s_code = models.CharField(max_length=7, default='', blank=True)
+    quality_status = models.CharField(max_length=10, choices=QUALITY_STATUS)
+    papers = models.IntegerField(default=0)
+    score_sum = models.FloatField(default=0.0)
+    plagiarism_issues = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['s_code', 'quality_status'], name='scrutiny_counter_bucket_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.s_code}/{self.quality_status}: {self.papers}"
+
+
+class QuestionBankEntry(models.Model):
+    """
+    One question extracted by scrutiny, kept for "has this appeared before"
+    search (scrutiny/question_bank.py). Entries outlive their ScrutinyResult,
+    e.g. when non-chosen candidates are deleted at finalize.
+    """
+    scrutiny_result = models.ForeignKey(ScrutinyResult, on_delete=models.SET_NULL, null=True, blank=True,
+                                        related_name='question_entries')
+    request_id = models.IntegerField(null=True, blank=True)
+    s_code = models.CharField(max_length=7, default='', blank=True)
+    position = models.PositiveIntegerField(default=0)
+    text = models.TextField()
+    bloom_level = models.CharField(max_length=20, default='', blank=True)
+    difficulty = models.CharField(max_length=10, default='', blank=True)
+    search_vector = SearchVectorField(null=True, blank=True)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='question_search_idx'),
+            GinIndex(fields=['text'], name='question_text_trgm_idx', opclasses=['gin_trgm_ops']),
+            models.Index(fields=['s_code', '-created_at'], name='question_scode_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.s_code} Q{self.position + 1}"
+
+
+class ArchivedScrutinyResult(models.Model):
+    """
+    Cold copy of a ScrutinyResult moved out by `manage.py archive_cold_rows`
+    (exams/archive.py). The summary is stored compressed and only decoded
+    when `summary` is read.
+    """
+    original_id = models.IntegerField(unique=True)
+    request_id = models.IntegerField(null=True, blank=True)
+    s_code = models.CharField(max_length=7, default='', blank=True)
+    overall_score = models.FloatField(default=0.0)
+    plagiarism_score = models.FloatField(default=0.0)
+    quality_status = models.CharField(max_length=10, choices=QUALITY_STATUS, default='poor')
+    summary_codec = models.CharField(max_length=8)
+    summary_blob = models.BinaryField()
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['request_id', '-created_at'], name='archived_scrutiny_request_idx'),
+        ]
+
+    @cached_property
+    def summary(self):
+        return decompress_json(self.summary_codec, self.summary_blob)
+
+    def __str__(self):
+        return f"Archived ScrutinyResult {self.original_id} for Request {self.request_id}"
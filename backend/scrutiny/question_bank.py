@@ -0,0 +1,95 @@
+"""
+Question bank: every question scrutiny extracts, searchable across subjects
+and years.
+
+Full-text matching uses the english tsvector in search_vector (GIN index
+question_search_idx); near-duplicate wording is caught with pg_trgm
+similarity on text (GIN index question_text_trgm_idx). Both predicates are
+index-backed, so a search is a bitmap OR of two index scans plus ranking of
+the matches.
+"""
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramSimilarity
+from django.db import transaction
+from django.db.models import F, Q
+
+from .models import QuestionBankEntry, ScrutinyResult
+
+SEARCH_CONFIG = "english"
+MAX_RESULTS = 100
+
+
+def _top_bloom_level(bloom):
+    if isinstance(bloom, dict) and bloom:
+        return max(bloom, key=lambda level: bloom[level] or 0)
+    return ""
+
+
+def _entries_for(result):
+    questions = (result.summary or {}).get("questions") or []
+    entries = []
+    for position, report in enumerate(questions):
+        text = (report or {}).get("text", "").strip() if isinstance(report, dict) else ""
+        if not text:
+            continue
+        entries.append(QuestionBankEntry(
+            scrutiny_result_id=result.pk,
+            request_id=result.request_obj_id,
+            s_code=result.s_code,
+            position=position,
+            text=text,
+            bloom_level=_top_bloom_level(report.get("bloom")),
+            difficulty=(report.get("difficulty") or {}).get("level", "") or "",
+            created_at=result.created_at,
+        ))
+    return entries
+
+
+def _write(entries):
+    created = QuestionBankEntry.objects.bulk_create(entries, batch_size=1000)
+    QuestionBankEntry.objects.filter(pk__in=[e.pk for e in created]).update(
+        search_vector=SearchVector("text", config=SEARCH_CONFIG)
+    )
+    return len(created)
+
+
+def index_result_questions(result):
+    """Add the questions of one ScrutinyResult; returns how many were stored."""
+    entries = _entries_for(result)
+    if not entries:
+        return 0
+    with transaction.atomic():
+        return _write(entries)
+
+
+def rebuild_question_bank(chunk_size=500):
+    """Re-extract the whole bank from the ScrutinyResult rows that still exist."""
+    stored = 0
+    with transaction.atomic():
+        QuestionBankEntry.objects.filter(scrutiny_result__isnull=False).delete()
+        batch = []
+        results = ScrutinyResult.objects.only("id", "request_obj_id", "s_code", "summary", "created_at")
+        for result in results.iterator(chunk_size=chunk_size):
+            batch.extend(_entries_for(result))
+            if len(batch) >= 1000:
+                stored += _write(batch)
+                batch = []
+        if batch:
+            stored += _write(batch)
+    return stored
+
+
+def search_questions(text, s_code=None, limit=20):
+    """Ranked matches for text: full-text hits first, then by trigram similarity."""
+    query = SearchQuery(text, config=SEARCH_CONFIG, search_type="websearch")
+    qs = QuestionBankEntry.objects.filter(Q(search_vector=query) | Q(text__trigram_similar=text))
+    if s_code:
+        qs = qs.filter(s_code=s_code)
+    return list(
+        qs.annotate(
+            rank=SearchRank(F("search_vector"), query),
+            similarity=TrigramSimilarity("text", text),
+        )
+        .order_by("-rank", "-similarity", "-created_at")
+        .values("id", "s_code", "request_id", "text", "bloom_level", "difficulty", "created_at", "rank", "similarity")
+        [:min(limit, MAX_RESULTS)]
+    )
@@ -3,7 +3,8 @@ import os
 import re
 from typing import List, Optional
 from django.db import transaction
-from .models import ScrutinyResult
+from django.db.models import Count, Q, Sum
+from .models import ScrutinyResult, ScrutinyDashboardCounter, PLAGIARISM_ISSUE_THRESHOLD
 from .nlp_utils import analyze_file
 from .vtu_fetcher import load_syllabus_metadata
 from exams.models import Request
@@ -197,50 +198,23 @@ def get_scrutiny_summary_for_dashboard() -> dict:
     Get summary statistics for the COE dashboard.
     """
     try:
-        total_papers = ScrutinyResult.objects.count()
-        
-        if total_papers == 0:
-            return {
-                "total_papers": 0,
-                "average_score": 0.0,
-                "papers_needing_review": 0,
-                "plagiarism_issues": 0,
-                "quality_distribution": {"excellent": 0, "good": 0, "fair": 0, "poor": 0}
-            }
-        
-        # Calculate statistics
-        results = ScrutinyResult.objects.all()
-        
-        scores = []
-        papers_needing_review = 0
-        plagiarism_issues = 0
+        # Read the rollup table: one row per quality bucket after grouping
+        buckets = ScrutinyDashboardCounter.objects.values('quality_status').annotate(
+            papers_total=Sum('papers'),
+            score_total=Sum('score_sum'),
+            plagiarism_total=Sum('plagiarism_issues'),
+        )
         quality_distribution = {"excellent": 0, "good": 0, "fair": 0, "poor": 0}
-        
-        for result in results:
-            summary = result.summary
-            score = summary.get('overall_score', 0.0)
-            scores.append(score)
-            
-            # Count papers needing review (low score or plagiarism issues)
-            if score < 0.6:
-                papers_needing_review += 1
-            
-            # Count plagiarism issues
-            plagiarism_score = summary.get('plagiarism_analysis', {}).get('plagiarism_score', 0.0)
-            if plagiarism_score > 0.3:
-                plagiarism_issues += 1
-            
-            # Quality distribution
-            if score >= 0.8:
-                quality_distribution["excellent"] += 1
-            elif score >= 0.6:
-                quality_distribution["good"] += 1
-            elif score >= 0.4:
-                quality_distribution["fair"] += 1
-            else:
-                quality_distribution["poor"] += 1
-        
-        average_score = sum(scores) / len(scores) if scores else 0.0
+        score_sum = 0.0
+        plagiarism_issues = 0
+        for bucket in buckets:
+            quality_distribution[bucket['quality_status']] = bucket['papers_total'] or 0
+            score_sum += bucket['score_total'] or 0.0
+            plagiarism_issues += bucket['plagiarism_total'] or 0
+        total_papers = sum(quality_distribution.values())
+        average_score = score_sum / total_papers if total_papers else 0.0
+        # "fair" and "poor" are exactly the results below REVIEW_THRESHOLD
+        papers_needing_review = quality_distribution["fair"] + quality_distribution["poor"]
         
         return {
             "total_papers": total_papers,
@@ -259,3 +233,25 @@ def get_scrutiny_summary_for_dashboard() -> dict:
             "plagiarism_issues": 0,
             "quality_distribution": {"excellent": 0, "good": 0, "fair": 0, "poor": 0}
         }
+
+
+def rebuild_dashboard_counters() -> int:
+    """
+    Recompute ScrutinyDashboardCounter from ScrutinyResult.
+    Returns the number of bucket rows written.
+    """
+    rows = (
+        ScrutinyResult.objects.values('s_code', 'quality_status')
+        .annotate(
+            papers=Count('id'),
+            score_sum=Sum('overall_score'),
+            plagiarism_issues=Count('id', filter=Q(plagiarism_score__gt=PLAGIARISM_ISSUE_THRESHOLD)),
+        )
+        .order_by()
+    )
+    with transaction.atomic():
+        ScrutinyDashboardCounter.objects.all().delete()
+        counters = ScrutinyDashboardCounter.objects.bulk_create(
+            [ScrutinyDashboardCounter(**row) for row in rows]
+        )
+    return len(counters)
@@ -1,5 +1,8 @@
 from rest_framework import serializers
-from .models import ScrutinyResult
+from exams.models import ArchivedRequest
+
+from .fieldsets import project_summary
+from .models import ArchivedScrutinyResult, ScrutinyResult
 
 class ScrutinyResultSerializer(serializers.ModelSerializer):
     request_info = serializers.SerializerMethodField()
@@ -17,6 +20,18 @@ class ScrutinyResultSerializer(serializers.ModelSerializer):
             "overall_score_display",
             "quality_status"
         ]
+
+    def __init__(self, *args, fields=None, projected_summary=False, **kwargs):
+        """
+        fields: keep only these top-level fields (see scrutiny/fieldsets.py).
+        projected_summary: read `summary` from the projected_summary annotation.
+        """
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+        if projected_summary and "summary" in self.fields:
+            self.fields["summary"] = serializers.JSONField(source="projected_summary", read_only=True)
     
     def get_request_info(self, obj):
         """Include basic request information for easier frontend display"""
@@ -32,17 +47,56 @@ class ScrutinyResultSerializer(serializers.ModelSerializer):
     
     def get_overall_score_display(self, obj):
         """Convert numeric score to percentage display"""
-        score = obj.summary.get('overall_score', 0.0)
-        return f"{int(score * 100)}%"
+        return f"{int(obj.overall_score * 100)}%"
     
     def get_quality_status(self, obj):
-        """Determine quality status based on score"""
-        score = obj.summary.get('overall_score', 0.0)
-        if score >= 0.8:
-            return "excellent"
-        elif score >= 0.6:
-            return "good"
-        elif score >= 0.4:
-            return "fair"
-        else:
-            return "poor"
+        """Quality bucket stored alongside the score"""
+        return obj.quality_status
+
+
+class ArchivedScrutinyResultSerializer(serializers.ModelSerializer):
+    """
+    Same shape as ScrutinyResultSerializer for a row in the archive tier, plus
+    "archived": true. The summary blob is only decompressed when "summary" is
+    part of the response.
+    """
+    id = serializers.IntegerField(source="original_id", read_only=True)
+    request_obj = serializers.IntegerField(source="request_id", read_only=True)
+    request_info = serializers.SerializerMethodField()
+    summary = serializers.SerializerMethodField()
+    overall_score_display = serializers.SerializerMethodField()
+    archived = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ArchivedScrutinyResult
+        fields = ScrutinyResultSerializer.Meta.fields + ["archived"]
+
+    def __init__(self, *args, fields=None, summary_paths=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.summary_paths = summary_paths
+        if fields is not None:
+            for name in set(self.fields) - set(fields) - {"archived"}:
+                self.fields.pop(name)
+
+    def get_request_info(self, obj):
+        archived = ArchivedRequest.objects.filter(original_id=obj.request_id).first()
+        if archived is None:
+            return None
+        return {
+            "id": archived.original_id,
+            "subject_code": archived.s_code,
+            "teacher_name": archived.tusername,
+            "status": archived.status,
+            "created_at": None,
+        }
+
+    def get_summary(self, obj):
+        if self.summary_paths:
+            return project_summary(obj.summary, self.summary_paths)
+        return obj.summary
+
+    def get_overall_score_display(self, obj):
+        return f"{int(obj.overall_score * 100)}%"
+
+    def get_archived(self, obj):
+        return True
@@ -0,0 +1,65 @@
+import logging
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from exams.delta import record_change
+from exams.events import publish
+from exams.models import Request
+from .models import ScrutinyResult, ScrutinyDashboardCounter, PLAGIARISM_ISSUE_THRESHOLD
+from .question_bank import index_result_questions
+
+logger = logging.getLogger(__name__)
+
+
+def apply_counter_delta(result, sign):
+    """Add (sign=1) or remove (sign=-1) one result from its dashboard bucket."""
+    with transaction.atomic():
+        counter, _ = ScrutinyDashboardCounter.objects.get_or_create(
+            s_code=result.s_code, quality_status=result.quality_status
+        )
+        plagiarism = sign if result.plagiarism_score > PLAGIARISM_ISSUE_THRESHOLD else 0
+        ScrutinyDashboardCounter.objects.filter(pk=counter.pk).update(
+            papers=F('papers') + sign,
+            score_sum=F('score_sum') + sign * result.overall_score,
+            plagiarism_issues=F('plagiarism_issues') + plagiarism,
+        )
+
+
+@receiver(post_save, sender=ScrutinyResult)
+def count_scrutiny_result(sender, instance, created, **kwargs):
+    if created:
+        apply_counter_delta(instance, 1)
+        publish({
+            "type": "scrutiny.created",
+            "id": instance.pk,
+            "request_id": instance.request_obj_id,
+            "s_code": instance.s_code,
+            "overall_score": instance.overall_score,
+            "quality_status": instance.quality_status,
+            "teacher_id": instance.request_obj.teacher_id if instance.request_obj_id else None,
+        })
+        try:
+            index_result_questions(instance)
+        except Exception:
+            # the bank can be rebuilt (manage.py rebuild_question_bank); never fail the scrutiny save
+            logger.exception("question bank indexing failed for scrutiny result %s", instance.pk)
+    record_change(sender._meta.label_lower, [instance.pk])
+
+
+@receiver(post_save, sender=Request)
+def log_request_info_change(sender, instance, created, **kwargs):
+    # results embed request_info (status, teacher, s_code), so they change with their request
+    if created:
+        return
+    ids = ScrutinyResult.objects.filter(request_obj_id=instance.pk).values_list('id', flat=True)
+    record_change(ScrutinyResult._meta.label_lower, list(ids))
+
+
+@receiver(post_delete, sender=ScrutinyResult)
+def uncount_scrutiny_result(sender, instance, **kwargs):
+    # Also runs for results cascaded from Request deletes (e.g. non-chosen candidates at finalize)
+    apply_counter_delta(instance, -1)
+    record_change(sender._meta.label_lower, [instance.pk], deleted=True)
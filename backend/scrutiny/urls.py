@@ -6,5 +6,6 @@ urlpatterns = [
     path("results/", views.ScrutinyResultsAPIView.as_view(), name="scrutiny-results"),
     path("summary/", views.ScrutinySummaryAPIView.as_view(), name="scrutiny-summary"),
     path("detail/<int:request_id>/", views.ScrutinyDetailAPIView.as_view(), name="scrutiny-detail"),
+    path("questions/search/", views.QuestionSearchAPIView.as_view(), name="scrutiny-question-search"),
     path("vtu-sync/", views.VTUSyncAPIView.as_view(), name="scrutiny-vtu-sync"),
 ]
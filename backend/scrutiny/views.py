@@ -3,17 +3,22 @@ import os
 
 from django.core.files import File
 from django.core.files.storage import default_storage
-from django.shortcuts import get_object_or_404
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from ems.db_router import replica_reads
+from exams.authentication import ClaimsJWTAuthentication
 from exams.models import SubjectCode
-from .models import ScrutinyResult
+from exams.delta import sync_response
+from exams.pagination import CreatedAtKeysetPagination
+from .fieldsets import parse_fields, summary_projection
+from .models import ArchivedScrutinyResult, ScrutinyResult
+from .question_bank import search_questions
 from .nlp_utils import analyze_file
 from .scrutiny_utils import get_scrutiny_summary_for_dashboard
-from .serializers import ScrutinyResultSerializer
+from .serializers import ArchivedScrutinyResultSerializer, ScrutinyResultSerializer
 from .vtu_fetcher import sync_vtu_resources
 
 logger = logging.getLogger(__name__)
@@ -39,25 +44,49 @@ class AnalyzeFileAPIView(APIView):
             except Exception:
                 pass
 
+def sparse_queryset(request, queryset):
+    """
+    Apply ?fields= / ?view= to a ScrutinyResult queryset.
+    Returns (queryset, serializer kwargs); raises ValueError on bad input.
+    """
+    fields, paths = parse_fields(request.query_params, ScrutinyResultSerializer.Meta.fields)
+    if fields is None or "request_info" in fields:
+        queryset = queryset.select_related('request_obj')
+    if paths is None:
+        return queryset, {"fields": fields}
+    queryset = queryset.defer('summary')
+    if paths:
+        queryset = queryset.annotate(projected_summary=summary_projection(paths))
+    return queryset, {"fields": fields, "projected_summary": bool(paths)}
+
+
+@replica_reads
 class ScrutinyResultsAPIView(APIView):
     """
     API endpoint to retrieve scrutiny results for all uploaded papers.
-    Used by COE dashboard.
+    Used by COE dashboard. Supports ?view=summary and ?fields=.
     """
+    authentication_classes = [ClaimsJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         try:
-            # Get all scrutiny results with related request information
-            results = ScrutinyResult.objects.select_related('request_obj').all().order_by('-created_at')
-            
-            # Serialize the results
-            serializer = ScrutinyResultSerializer(results, many=True)
-            
-            return Response({
-                "results": serializer.data,
-                "count": results.count()
-            }, status=status.HTTP_200_OK)
+            try:
+                results, opts = sparse_queryset(request, ScrutinyResult.objects.order_by('-created_at', '-id'))
+            except ValueError as e:
+                return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+            def full():
+                # Keyset page of results; the response carries next/previous cursors instead of a count
+                paginator = CreatedAtKeysetPagination()
+                page = paginator.paginate_queryset(results, request, view=self)
+                serializer = ScrutinyResultSerializer(page, many=True, **opts)
+                return paginator.get_paginated_response(serializer.data)
+
+            return sync_response(
+                request, "scrutiny.scrutinyresult", results,
+                lambda rows: ScrutinyResultSerializer(rows, many=True, **opts).data, full,
+            )
             
         except Exception as e:
             logger.exception(f"Error retrieving scrutiny results: {e}")
@@ -66,10 +95,12 @@ class ScrutinyResultsAPIView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+@replica_reads
 class ScrutinySummaryAPIView(APIView):
     """
     API endpoint to get summary statistics for COE dashboard.
     """
+    authentication_classes = [ClaimsJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
@@ -86,14 +117,23 @@ class ScrutinySummaryAPIView(APIView):
 
 class ScrutinyDetailAPIView(APIView):
     """
-    API endpoint to get detailed scrutiny result for a specific paper.
+    API endpoint to get detailed scrutiny result for a specific paper
+    (the latest one if the paper was re-scrutinized). This is where the full
+    per-question summary is loaded from; ?fields= works here too. Requests
+    moved to the archive tier (exams/archive.py) are served from there.
     """
     permission_classes = [IsAuthenticated]
 
     def get(self, request, request_id):
         try:
-            scrutiny_result = get_object_or_404(ScrutinyResult, request_obj_id=request_id)
-            serializer = ScrutinyResultSerializer(scrutiny_result)
+            try:
+                results, opts = sparse_queryset(request, ScrutinyResult.objects.filter(request_obj_id=request_id))
+            except ValueError as e:
+                return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            scrutiny_result = results.order_by('-created_at', '-id').first()
+            if scrutiny_result is None:
+                return self.archived(request, request_id)
+            serializer = ScrutinyResultSerializer(scrutiny_result, **opts)
             return Response(serializer.data, status=status.HTTP_200_OK)
             
         except Exception as e:
@@ -103,6 +143,38 @@ class ScrutinyDetailAPIView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    def archived(self, request, request_id):
+        fields, paths = parse_fields(request.query_params, ScrutinyResultSerializer.Meta.fields)
+        archived = ArchivedScrutinyResult.objects.filter(request_id=request_id).order_by('-created_at', '-id')
+        if paths == []:
+            archived = archived.defer('summary_blob')
+        result = archived.first()
+        if result is None:
+            return Response({"detail": "Not found"}, status=status.HTTP_404_NOT_FOUND)
+        serializer = ArchivedScrutinyResultSerializer(result, fields=fields, summary_paths=paths)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+@replica_reads
+class QuestionSearchAPIView(APIView):
+    """
+    Search the historical question bank: ?q=<text>[&s_code=][&limit=20].
+    Full-text matches rank first, near-identical wording (trigram) after.
+    """
+    authentication_classes = [ClaimsJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        q = (request.query_params.get("q") or "").strip()
+        if len(q) < 3:
+            return Response({"detail": "q must be at least 3 characters"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = int(request.query_params.get("limit", 20))
+        except ValueError:
+            return Response({"detail": "limit must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        results = search_questions(q, s_code=request.query_params.get("s_code"), limit=max(limit, 1))
+        return Response({"query": q, "results": results}, status=status.HTTP_200_OK)
+
 
 class VTUSyncAPIView(APIView):
     """
@@ -38,6 +38,8 @@ export const coeCreateRequest = (formData) =>
 
 export const coeListRequests = () => client.get("coe/requests/");
 
+export const coeDashboard = () => client.get("coe/dashboard/");
+
 export const coeGetCandidates = (s_code) =>
   client.get(`coe/candidates/?s_code=${encodeURIComponent(s_code)}`);
 
@@ -49,8 +51,8 @@ export const listFinalPapers = () =>
   client.get("sup/final-papers/");
 
 // Scrutiny API endpoints
-export const scrutinyGetResults = () =>
-  client.get("scrutiny/results/");
+export const scrutinyGetResults = (params = { view: "summary" }) =>
+  client.get("scrutiny/results/", { params });
 
 export const scrutinyGetSummary = () =>
   client.get("scrutiny/summary/");
@@ -2,6 +2,8 @@ import axios from "axios";
 
 const client = axios.create({
   baseURL: "http://127.0.0.1:8000/api/",
+  // send back the read-your-writes pin cookie (backend/ems/db_router.py)
+  withCredentials: true,
 });
 
 // Interceptor to attach token, except for login/register
@@ -7,7 +7,7 @@ export const getTeacherPending = async () => {
 
 export const getTeacherAccepted = async () => {
   const { data } = await client.get("teacher/requests/accepted/");
-  return data;
+  return data.results || [];
 };
 
 export const acceptRequest = (id) =>
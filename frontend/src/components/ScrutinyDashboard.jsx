@@ -1,5 +1,5 @@
 import { useEffect, useState } from "react";
-import { scrutinyGetResults, scrutinyGetSummary, scrutinySyncVTU } from "../api/auth";
+import { scrutinyGetDetail, scrutinyGetResults, scrutinyGetSummary, scrutinySyncVTU } from "../api/auth";
 
 export default function ScrutinyDashboard() {
   const [summary, setSummary] = useState(null);
@@ -90,9 +90,16 @@ export default function ScrutinyDashboard() {
     return "text-red-600";
   };
 
-  const openDetailModal = (result) => {
+  const openDetailModal = async (result) => {
+    // the list only carries summary fields; fetch the full report on demand
     setSelectedResult(result);
     setShowDetailModal(true);
+    try {
+      const { data } = await scrutinyGetDetail(result.request_obj);
+      setSelectedResult(data);
+    } catch (error) {
+      console.error("Error loading scrutiny detail:", error);
+    }
   };
 
   if (loading) {
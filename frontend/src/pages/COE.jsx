@@ -4,7 +4,7 @@ import ScrutinyDashboard from "../components/ScrutinyDashboard";
 import {
   coeGetTeachers,
   coeCreateRequest,
-  coeListRequests,
+  coeDashboard,
   coeGetCandidates,
   coeFinalize,
 } from "../api/auth";
@@ -38,8 +38,8 @@ export default function COE() {
 
   const loadRequests = async () => {
     try {
-      const { data } = await coeListRequests();
-      setRequests(data || []);
+      const { data } = await coeDashboard();
+      setRequests(data.requests || []);
     } catch (err) {
       console.error(err);
       setRequests([]);
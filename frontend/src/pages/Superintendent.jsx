@@ -8,7 +8,7 @@ export default function Superintendent() {
 
   const load = async () => {
     const { data } = await listFinalPapers();
-    setPapers(data);
+    setPapers(data.results || []);
   };
   useEffect(()=>{ load(); }, []);
 